@@ -0,0 +1,13 @@
+"""Helpers shared by the tutorial models to evaluate, cache and inspect
+ParaPy product trees efficiently.
+
+The tutorial modules themselves only import ParaPy and their siblings, so
+every exercise folder runs on its own. The variants that use these helpers
+live in separate modules next to them (e.g. ``staircase_layouts.py`` next
+to ``exe_5_6_staircase.py``), as do the benchmarks. Those import
+``kbe_tools`` and modules of other folders by package path, so they are run
+with the repository root on the path. Modules in the same folder are
+imported by package path too, except in ``exe10_geometryless_aircraft``:
+its tutorial modules import each other as scripts, so they can only be
+imported as siblings there.
+"""
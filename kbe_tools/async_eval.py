@@ -0,0 +1,108 @@
+"""Awaitable evaluation of slots, for models embedded in asyncio services.
+
+Evaluating a slow attribute inside a coroutine blocks the event loop for
+every client. An :class:`AsyncEvaluator` evaluates slots of one model on a
+worker thread instead::
+
+    evaluator = AsyncEvaluator(Aircraft())
+    area = await evaluator.get("wing.area")
+    values = await evaluator.gather("volume", "engines_volume")
+    await evaluator.set("wing.b", 40)
+
+* concurrent requests for the same slot path share one evaluation;
+* a request is cancelled with its awaiting task; the evaluation itself is
+  only cancelled once no one waits for it any more, and an evaluation that
+  has already started on the worker runs to completion (a thread cannot be
+  interrupted), its result is then simply dropped;
+* inputs set with :meth:`AsyncEvaluator.set` are applied on the same worker
+  thread, after the evaluations queued before them, and a result read
+  before an input changed is evaluated again, so a request that was made
+  after ``set`` never returns a value of the old inputs.
+
+ParaPy objects are not thread-safe, so all access to the model goes through
+the evaluator's single worker thread.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from kbe_tools.slots import get_path, set_path
+
+
+class _Request:
+    """An evaluation in flight and the number of callers waiting for it."""
+
+    def __init__(self, task):
+        self.task = task
+        self.waiters = 0
+
+
+class AsyncEvaluator:
+    """Evaluates the slots of ``obj`` off the event loop.
+
+    :param obj: root of the model
+    """
+
+    def __init__(self, obj):
+        self.obj = obj
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        #: incremented on every input change
+        self.generation = 0
+        self._inflight = {}
+
+    async def _run(self, function, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, function, *args)
+
+    async def _evaluate(self, path):
+        while True:
+            generation = self.generation
+            value = await self._run(get_path, self.obj, path)
+            if generation == self.generation:
+                return value
+            # an input changed while evaluating: the value may be stale
+
+    async def get(self, path):
+        """The value of the slot at ``path``."""
+        request = self._inflight.get(path)
+        if request is None:
+            request = _Request(asyncio.ensure_future(self._evaluate(path)))
+            self._inflight[path] = request
+            request.task.add_done_callback(
+                lambda task: self._inflight.pop(path, None)
+                if self._inflight.get(path) is request else None)
+        request.waiters += 1
+        try:
+            return await asyncio.shield(request.task)
+        finally:
+            request.waiters -= 1
+            if request.waiters == 0 and not request.task.done():
+                # the cancelled task only ends at its next await; a later
+                # request must start a new evaluation instead of joining it
+                if self._inflight.get(path) is request:
+                    del self._inflight[path]
+                request.task.cancel()
+
+    async def gather(self, *paths):
+        """The values of all ``paths``, evaluated concurrently.
+
+        :rtype: dict
+        """
+        values = await asyncio.gather(*(self.get(path) for path in paths))
+        return dict(zip(paths, values))
+
+    async def set(self, path, value):
+        """Sets an input. Evaluations in flight are redone if they read the
+        model before the change.
+        """
+        self.generation += 1
+        # requests made from now on must not join an evaluation that may
+        # have read the old inputs
+        self._inflight.clear()
+        await self._run(set_path, self.obj, path, value)
+
+    def close(self):
+        """Cancels pending evaluations and stops the worker thread."""
+        for request in list(self._inflight.values()):
+            request.task.cancel()
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,140 @@
+"""Child inputs of quantified parts compiled into columns.
+
+ParaPy evaluates the keyword expressions of a quantified part once per
+child, with its own ``child.index``: for ``Wing.airfoils`` that is the
+``pass_down``, the ``map_down`` lookup and ``chord=0.1*(child.index+1)``.
+:class:`ChildColumns` evaluates them once for all indices, as one column (a
+NumPy array, or a single shared value) per child input, and builds children
+from them without running a rule per child, as ``LazyWing`` of
+``lazy_wing.py`` does::
+
+    @Attribute
+    def lazy_airfoils(self):
+        columns = ChildColumns.from_rule(
+            self, self.n_airfoils,
+            pass_down="thickness",
+            map_down="lift_coefficients->lift_coefficient",
+            chord=lambda index: 0.1 * (index + 1))
+        return columns.sequence(Airfoil)
+
+Looking the columns up from the rule of a quantified ``@Part`` instead
+(``**columns.inputs(child.index)``) does not pay off: ParaPy still runs the
+rule once per child, and the lookup was measured slower than its own
+evaluation of the expressions (19.1 ms against 4.3 ms for 10 ** 4 airfoils).
+
+Index expressions are functions of the array of all indices, so they must
+be written with NumPy operations (arithmetic as above works unchanged).
+Like a ``map_down`` source, a column must hold at least one value per
+child; values past the last child are ignored (``Wing`` maps its three
+``lift_coefficients`` on two airfoils by default).
+"""
+
+import numpy as np
+
+from kbe_tools.lazy_sequence import LazySequence
+
+
+def parse_down(spec):
+    """(source, target) pairs of a ``pass_down`` or ``map_down`` string such
+    as ``"thickness"`` or ``"lift_coefficients->lift_coefficient, span"``.
+
+    :rtype: list[tuple[str, str]]
+    """
+    pairs = []
+    for item in spec.split(","):
+        source, _, target = item.strip().partition("->")
+        pairs.append((source.strip(), target.strip() or source.strip()))
+    return pairs
+
+
+def _column(values):
+    """NumPy array of ``values`` if they are numbers, else a list."""
+    if isinstance(values, np.ndarray):
+        return values
+    array = np.asarray(values)
+    return array if array.ndim == 1 and array.dtype != object \
+        else list(values)
+
+
+class ChildColumns:
+    """Inputs of ``length`` children, one column per input.
+
+    :param int length: number of children
+    :param dict shared: values passed to every child unchanged
+    :param dict columns: sequences with at least one value per child
+    :param dict expressions: functions of the (length,) array of indices
+        that return one value per child
+    """
+
+    def __init__(self, length, shared=None, columns=None, expressions=None):
+        self.length = length
+        self.shared = dict(shared or {})
+        self.columns = {}
+        for name, values in (columns or {}).items():
+            if len(values) < length:
+                raise ValueError(f"column {name!r} has {len(values)} values "
+                                 f"for {length} children")
+            self.columns[name] = _column(values)
+        index = np.arange(length)
+        for name, expression in (expressions or {}).items():
+            values = np.asarray(expression(index))
+            # an expression that does not depend on the index is shared
+            if values.ndim == 0:
+                self.shared[name] = values.item()
+            elif len(values) not in (1, length):
+                raise ValueError(f"expression {name!r} gives {len(values)} "
+                                 f"values for {length} children")
+            else:
+                self.columns[name] = np.broadcast_to(values, (length,) +
+                                                     values.shape[1:])
+
+    @classmethod
+    def from_rule(cls, owner, length, pass_down="", map_down="",
+                  **expressions):
+        """Compiles the keyword expressions of a quantified part of
+        ``owner``, with ``pass_down`` and ``map_down`` in ParaPy's notation
+        and the other inputs as functions of the index array (or constants).
+
+        :rtype: ChildColumns
+        """
+        shared = {target: getattr(owner, source)
+                  for source, target in parse_down(pass_down) if source}
+        columns = {target: getattr(owner, source)
+                   for source, target in parse_down(map_down) if source}
+        constant = {name: value for name, value in expressions.items()
+                    if not callable(value)}
+        shared.update(constant)
+        return cls(length, shared, columns,
+                   {name: value for name, value in expressions.items()
+                    if name not in constant})
+
+    def __len__(self):
+        return self.length
+
+    def __repr__(self):
+        return (f"ChildColumns({self.length}, shared={sorted(self.shared)}, "
+                f"columns={sorted(self.columns)})")
+
+    def inputs(self, index):
+        """The input values of child ``index``.
+
+        :rtype: dict
+        """
+        if not -self.length <= index < self.length:
+            raise IndexError(f"child index {index} out of range")
+        # columns may be longer than length, so count from the front
+        index %= self.length
+        values = dict(self.shared)
+        for name, column in self.columns.items():
+            value = column[index]
+            values[name] = value.item() if isinstance(value, np.generic) \
+                else value
+        return values
+
+    def sequence(self, cls, cache_size=128):
+        """Lazy sequence of ``cls`` instances built from the columns.
+
+        :rtype: LazySequence
+        """
+        return LazySequence(self.length, lambda i: cls(**self.inputs(i)),
+                            cache_size)
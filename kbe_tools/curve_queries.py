@@ -0,0 +1,125 @@
+"""Batched projection of many points onto many curves.
+
+``BSplineSamples`` used to project its point once per curve for
+``projected_points``, a second time for ``distances_from_point``, and then
+asked for the tangent at each projection separately. :class:`CurveQueries`
+answers all of these in one call, for any number of query points, and
+returns the projected point, distance, curve parameter ``u`` and tangent
+together as arrays of shape (points, curves, ...).
+
+Two methods are available:
+
+* ``"exact"``: one ``projected_point`` and one ``tangent_at_point`` kernel
+  call per (point, curve) pair, computed once and shared. Tangents are the
+  ones returned by ``tangent_at_point``;
+* ``"sampled"``: every curve is sampled once into a fine polyline; all
+  queries are then answered with vectorized NumPy operations, with unit
+  tangents along the closest polyline segment. The error is
+  of the order of the chordal deviation of the polyline, which decreases
+  quadratically with ``samples``.
+"""
+
+import numpy as np
+from parapy.geom import Point, Vector
+
+
+class CurveQueries:
+    """Projection engine for a fixed set of curves.
+
+    :param curves: sequence of ParaPy curves
+    :param int samples: number of polyline points per curve for the
+        ``"sampled"`` method
+    :param int chunk: number of query points processed at once by the
+        ``"sampled"`` method, which bounds the temporary memory
+    """
+
+    def __init__(self, curves, samples=500, chunk=1024):
+        self.curves = list(curves)
+        self.samples = samples
+        self.chunk = chunk
+        self._polylines = None
+
+    @property
+    def polylines(self):
+        """Per curve: (samples, 3) points and (samples,) parameters, built
+        on first use.
+        """
+        if self._polylines is None:
+            self._polylines = []
+            for crv in self.curves:
+                pts = crv.equispaced_points(self.samples)
+                u = [crv.projected_point(pt)["u"] for pt in pts]
+                self._polylines.append((np.array([tuple(pt) for pt in pts],
+                                                 dtype=float),
+                                        np.array(u, dtype=float)))
+        return self._polylines
+
+    def project(self, points, method="exact"):
+        """Projects every point onto every curve.
+
+        :param points: sequence of Points or (n, 3) array
+        :param str method: ``"exact"`` or ``"sampled"``
+        :return: dictionary of arrays with keys ``"point"`` (n, c, 3),
+            ``"distance"`` (n, c), ``"u"`` (n, c) and ``"tangent"`` (n, c, 3)
+        :rtype: dict[str, numpy.ndarray]
+        """
+        points = np.array([tuple(pt) for pt in points], dtype=float) \
+            if not isinstance(points, np.ndarray) else points
+        if method == "exact":
+            return self._project_exact(points)
+        elif method == "sampled":
+            return self._project_sampled(points)
+        raise ValueError(f"unknown method {method!r}")
+
+    def _project_exact(self, points):
+        n, c = len(points), len(self.curves)
+        result = {"point": np.empty((n, c, 3)), "distance": np.empty((n, c)),
+                  "u": np.empty((n, c)), "tangent": np.empty((n, c, 3))}
+        for i, coords in enumerate(points.tolist()):
+            pt = Point(*coords)
+            for j, crv in enumerate(self.curves):
+                projection = crv.projected_point(pt)
+                result["point"][i, j] = tuple(projection["point"])
+                result["distance"][i, j] = projection["distance"]
+                result["u"][i, j] = projection["u"]
+                result["tangent"][i, j] = tuple(
+                    crv.tangent_at_point(projection["point"]))
+        return result
+
+    def _project_sampled(self, points):
+        n, c = len(points), len(self.curves)
+        result = {"point": np.empty((n, c, 3)), "distance": np.empty((n, c)),
+                  "u": np.empty((n, c)), "tangent": np.empty((n, c, 3))}
+        for j, (poly, u) in enumerate(self.polylines):
+            start, seg = poly[:-1], np.diff(poly, axis=0)
+            seg_len2 = np.einsum("ij,ij->i", seg, seg)
+            seg_len2[seg_len2 == 0] = 1.
+            tangents = seg / np.sqrt(seg_len2)[:, None]
+            for lo in range(0, n, self.chunk):
+                p = points[lo:lo + self.chunk]
+                # parameter of the closest point on every segment, in [0, 1]
+                rel = p[:, None, :] - start[None, :, :]
+                t = np.clip(np.einsum("psk,sk->ps", rel, seg) / seg_len2,
+                            0., 1.)
+                closest = start[None] + t[..., None] * seg[None]
+                dist2 = np.einsum("psk,psk->ps", p[:, None] - closest,
+                                  p[:, None] - closest)
+                best = np.argmin(dist2, axis=1)
+                rows = np.arange(len(p))
+                tb = t[rows, best]
+                hi = lo + len(p)
+                result["point"][lo:hi, j] = closest[rows, best]
+                result["distance"][lo:hi, j] = np.sqrt(dist2[rows, best])
+                result["u"][lo:hi, j] = u[best] + tb * (u[best + 1] - u[best])
+                result["tangent"][lo:hi, j] = tangents[best]
+        return result
+
+
+def as_points(array):
+    """List of Points from an (n, 3) array."""
+    return [Point(*row) for row in np.asarray(array).tolist()]
+
+
+def as_vectors(array):
+    """List of Vectors from an (n, 3) array."""
+    return [Vector(*row) for row in np.asarray(array).tolist()]
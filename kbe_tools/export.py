@@ -0,0 +1,242 @@
+"""Headless export of the parts of a product tree to STEP, STL and glTF.
+
+Instantiates a class given as ``"module:Class"`` with inputs read from JSON
+(or YAML, when PyYAML is installed) files, walks its parts and writes the
+selected ones without starting the GUI. Every (configuration, part, format)
+is exported by a worker process, and each file is reported as soon as it is
+written, so hundreds of configurations can be regenerated in parallel::
+
+    python -m kbe_tools.export \\
+        tut3.exercises_11_to_15.exercise_15_solids_overview:BuildingSolids \\
+        configs/*.json --parts box "*_sld" --formats step stl gltf --out out
+
+Part paths are slot names below the root, with indices for quantified parts
+and dots for nested ones, e.g. ``steps[3]`` or ``wing.airfoils[0]``; the
+``--parts`` patterns are matched against them with :mod:`fnmatch`.
+"""
+
+import argparse
+import base64
+import importlib
+import json
+import os
+import re
+import sys
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from fnmatch import fnmatch
+from inspect import getattr_static
+
+from parapy.core import Base
+
+from kbe_tools.slots import get_path, part_names
+from kbe_tools.tessellation_cache import TessellationCache
+
+FORMATS = {"step": ".stp", "stl": ".stl", "gltf": ".gltf"}
+
+
+def load_class(spec):
+    """The class named by ``"package.module:Class"``."""
+    module, _, name = spec.partition(":")
+    if not name:
+        raise ValueError(f"expected 'module:Class', got {spec!r}")
+    return getattr(importlib.import_module(module), name)
+
+
+def load_inputs(path):
+    """Input values from a JSON or YAML file holding a mapping. An empty
+    YAML file holds no inputs.
+
+    :rtype: dict
+    """
+    with open(path) as f:
+        if path.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError(f"PyYAML is required to read {path}")
+            inputs = yaml.safe_load(f)
+            if inputs is None:
+                inputs = {}
+        else:
+            inputs = json.load(f)
+    if not isinstance(inputs, dict):
+        raise ValueError(f"{path} does not hold a mapping of inputs")
+    return inputs
+
+
+def walk_parts(obj, prefix=""):
+    """Yields (path, part) for all parts below ``obj``, depth first.
+
+    Quantified parts yield one path per child, e.g. ``steps[0]``;
+    suppressed parts (``Undefined``) are skipped.
+    """
+    for name in part_names(type(obj)):
+        value = getattr(obj, name)
+        if isinstance(value, Base):
+            children = [(f"{prefix}{name}", value)]
+        elif isinstance(value, Iterable):
+            children = [(f"{prefix}{name}[{i}]", item)
+                        for i, item in enumerate(value)]
+        else:
+            continue
+        for path, child in children:
+            yield path, child
+            yield from walk_parts(child, prefix=path + ".")
+
+
+def has_shape(part):
+    """Whether ``part`` is of a class with a kernel shape, decided from the
+    class so the (lazy) shape itself is not built.
+
+    :rtype: bool
+    """
+    return getattr_static(type(part), "TopoDS_Shape", None) is not None
+
+
+def select_parts(obj, patterns):
+    """Paths of the parts of ``obj`` that have a shape and match any of
+    ``patterns``. The part objects are created, but none of their shapes is
+    built.
+
+    :rtype: list[str]
+    """
+    return [path for path, part in walk_parts(obj)
+            if any(fnmatch(path, pattern) for pattern in patterns)
+            and has_shape(part)]
+
+
+def write_step(shape, filename):
+    from parapy.exchange import STEPWriter
+    STEPWriter(nodes=[shape], filename=filename).write()
+
+
+def write_stl(shape, filename):
+    from parapy.exchange import STLWriter
+    STLWriter(nodes=[shape], filename=filename).write()
+
+
+def write_gltf(shape, filename, cache=None, lod="medium"):
+    """Writes the global mesh of ``shape`` as a glTF 2.0 file with an
+    embedded buffer.
+    """
+    mesh = (cache or TessellationCache()).mesh(shape, lod)
+    vertices = mesh.vertices.astype("<f4").reshape(-1, 3)
+    indices = mesh.triangles.astype("<u4")
+    data = vertices.tobytes() + indices.tobytes()
+    lower, upper = (vertices.min(axis=0), vertices.max(axis=0)) \
+        if len(vertices) else ([0., 0., 0.], [0., 0., 0.])
+    gltf = {
+        "asset": {"version": "2.0", "generator": "kbe_tools.export"},
+        "scene": 0, "scenes": [{"nodes": [0]}],
+        "nodes": [{"mesh": 0}],
+        "meshes": [{"primitives": [{"attributes": {"POSITION": 0},
+                                    "indices": 1}]}],
+        "buffers": [{"byteLength": len(data),
+                     "uri": "data:application/octet-stream;base64," +
+                            base64.b64encode(data).decode()}],
+        "bufferViews": [
+            {"buffer": 0, "byteOffset": 0, "byteLength": vertices.nbytes,
+             "target": 34962},
+            {"buffer": 0, "byteOffset": vertices.nbytes,
+             "byteLength": indices.nbytes, "target": 34963}],
+        "accessors": [
+            {"bufferView": 0, "componentType": 5126, "type": "VEC3",
+             "count": len(vertices),
+             "min": [float(x) for x in lower],
+             "max": [float(x) for x in upper]},
+            {"bufferView": 1, "componentType": 5125, "type": "SCALAR",
+             "count": indices.size}]}
+    with open(filename, "w") as f:
+        json.dump(gltf, f)
+
+
+WRITERS = {"step": write_step, "stl": write_stl, "gltf": write_gltf}
+
+#: model instances of the configurations last used by a worker process,
+#: keyed on (spec, inputs), least recently used first
+_MODELS = {}
+_MAX_MODELS = 8
+
+
+def _model(spec, inputs):
+    key = (spec, json.dumps(inputs, sort_keys=True))
+    model = _MODELS.pop(key, None)
+    if model is None:
+        model = load_class(spec)(**inputs)
+        if len(_MODELS) >= _MAX_MODELS:
+            del _MODELS[next(iter(_MODELS))]
+    _MODELS[key] = model
+    return model
+
+
+def _export_part(spec, inputs, path, fmt, filename):
+    """Worker function: exports the part at ``path`` of one configuration."""
+    WRITERS[fmt](get_path(_model(spec, inputs), path), filename)
+    return filename
+
+
+def _file_name(path):
+    return re.sub(r"[^\w.-]+", "_", path).strip("_")
+
+
+def export(spec, configurations, patterns=("*",), formats=("step",),
+           directory=".", n_workers=None):
+    """Exports the selected parts of every configuration and yields the
+    written file names as they complete.
+
+    :param str spec: ``"module:Class"`` of the root class
+    :param dict configurations: inputs per configuration name; each
+        configuration is written to its own sub-directory
+    :param patterns: :mod:`fnmatch` patterns of the part paths to export
+    :param formats: any of ``"step"``, ``"stl"`` and ``"gltf"``
+    :param int n_workers: number of worker processes
+    """
+    cls = load_class(spec)
+    jobs = []
+    for name, inputs in configurations.items():
+        folder = os.path.join(directory, name)
+        os.makedirs(folder, exist_ok=True)
+        for path in select_parts(cls(**inputs), patterns):
+            for fmt in formats:
+                jobs.append((spec, inputs, path, fmt, os.path.join(
+                    folder, _file_name(path) + FORMATS[fmt])))
+    # jobs are ordered per configuration, so workers mostly reuse a model
+    with ProcessPoolExecutor(n_workers) as pool:
+        futures = [pool.submit(_export_part, *job) for job in jobs]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("spec", help="root class as module:Class")
+    parser.add_argument("inputs", nargs="*",
+                        help="JSON/YAML input files, one per configuration")
+    parser.add_argument("--parts", nargs="+", default=["*"],
+                        help="fnmatch patterns of the part paths to export")
+    parser.add_argument("--formats", nargs="+", default=["step"],
+                        choices=list(FORMATS))
+    parser.add_argument("--out", default="export")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--list", action="store_true",
+                        help="only print the selected part paths")
+    args = parser.parse_args(argv)
+
+    configurations = {os.path.splitext(os.path.basename(path))[0]:
+                      load_inputs(path) for path in args.inputs} \
+        or {"default": {}}
+    if args.list:
+        cls = load_class(args.spec)
+        for name, inputs in configurations.items():
+            for path in select_parts(cls(**inputs), args.parts):
+                print(f"{name}: {path}")
+        return 0
+    for filename in export(args.spec, configurations, args.parts,
+                           args.formats, args.out, args.workers):
+        print(filename, flush=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""Memory-mapped loading and tiling of large control-point grids.
+
+:func:`load_grid` maps a binary grid file (``.npy`` or raw float64) into
+memory without reading it: the operating system only pages in the parts of
+the file that are actually accessed. The result is a :class:`PointCloud` that
+can be given directly as the ``data`` input of the surface samples of
+``array_surfaces.py``.
+
+For grids that are too large to build a single surface from, :func:`tiles`
+splits the grid into tiles of at most ``tile_rows`` x ``tile_cols`` control
+points. Neighbouring tiles share their boundary row/column, so the patches
+built from them meet along a common edge. :func:`stream_patches` builds one
+patch per tile at a time, so peak memory is bounded by the tile size rather
+than by the file size.
+"""
+
+import numpy as np
+
+from kbe_tools.point_cloud import PointCloud
+
+
+def load_grid(path, shape=None, offset=0):
+    """Memory-maps a grid of points, read-only.
+
+    :param str path: ``.npy`` file, or raw little-endian float64 file
+    :param shape: (rows, columns) of the grid; required for raw files
+    :param int offset: number of header bytes to skip in raw files
+    :rtype: PointCloud
+    """
+    if str(path).endswith(".npy"):
+        coords = np.load(path, mmap_mode="r")
+    else:
+        if shape is None:
+            raise ValueError("the shape of a raw grid file must be given")
+        coords = np.memmap(path, dtype="<f8", mode="r", offset=offset,
+                           shape=tuple(shape[:2]) + (3,))
+    if coords.ndim != 3 or coords.shape[-1] != 3:
+        raise ValueError(f"expected a grid of shape (rows, columns, 3), got "
+                         f"{coords.shape}")
+    return PointCloud.from_array(coords)
+
+
+def _starts(size, tile):
+    """Start indices of tiles of ``tile`` points overlapping by one."""
+    if tile < 2:
+        raise ValueError("a tile needs at least 2 x 2 control points")
+    return list(range(0, max(size - 1, 1), tile - 1))
+
+
+def tiles(shape, tile_rows, tile_cols):
+    """Index ranges of the tiles of a grid.
+
+    :param shape: (rows, columns, ...) of the grid
+    :return: list of ((row_start, row_stop), (col_start, col_stop))
+    :rtype: list[tuple]
+    """
+    rows, cols = shape[:2]
+    return [((i, min(i + tile_rows, rows)), (j, min(j + tile_cols, cols)))
+            for i in _starts(rows, tile_rows)
+            for j in _starts(cols, tile_cols)]
+
+
+def tile_view(grid, row_range, col_range):
+    """Zero-copy view of one tile of ``grid``.
+
+    :rtype: PointCloud
+    """
+    coords = np.asarray(grid)
+    return PointCloud.from_array(coords[slice(*row_range), slice(*col_range)])
+
+
+def stream_patches(grid, tile_rows, tile_cols, build):
+    """Builds and yields one surface patch per tile, e.g. with
+    ``build=lambda pts: BSplineSurface(control_points=pts)``. Only the
+    current tile is held in memory, as long as the caller does not keep the
+    yielded patches.
+    """
+    for row_range, col_range in tiles(np.shape(grid), tile_rows, tile_cols):
+        yield build(tile_view(grid, row_range, col_range))
@@ -0,0 +1,158 @@
+"""Instance buffers for quantified, identical shapes.
+
+Quantified parts such as ``StairCase.steps``, ``Train.wagon`` or
+``Aircraft.propulsion_sys`` create many shapes with the same definition that
+only differ in ``position`` and ``color``. Drawing every shape with its own
+mesh costs one draw call and one vertex buffer per shape. :func:`instance_batches`
+groups shapes on their definition key (see
+:mod:`kbe_tools.tessellation_cache`) instead, and describes each group as one
+shared mesh plus a per-instance buffer of 4x4 transforms and RGBA colors, as
+consumed by instanced draw calls (``glDrawElementsInstanced`` and the
+like)::
+
+    batches, singles = instance_batches(geometric_children(obj))
+    for batch in batches:
+        upload(batch.mesh, batch.transforms, batch.colors)   # one draw call
+
+The number of draw calls and the size of the mesh data then stay constant as
+``n_step`` or ``number_of_wagons`` grow; only the instance buffers grow, by
+80 bytes per instance. :func:`world_vertices` runs the vertex stage of such
+a draw on the CPU, which is what an offscreen software renderer does, and
+is used to measure frame times.
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+
+from kbe_tools.tessellation_cache import TessellationCache, _frame
+
+#: RGBA of the color names used by the tutorial models, used when
+#: matplotlib is not available to resolve other names
+BASIC_COLORS = {
+    "black": (0., 0., 0.), "white": (1., 1., 1.), "red": (1., 0., 0.),
+    "green": (0., .5, 0.), "blue": (0., 0., 1.), "yellow": (1., 1., 0.),
+    "orange": (1., .647, 0.), "grey": (.5, .5, .5), "gray": (.5, .5, .5)}
+
+
+def rgba(color, default=(.5, .5, .5, 1.)):
+    """RGBA tuple in [0, 1] of a color name, RGB(A) tuple or None.
+
+    :rtype: tuple
+    """
+    if color is None:
+        return default
+    if isinstance(color, str):
+        try:
+            from matplotlib.colors import to_rgba
+        except ImportError:
+            rgb = BASIC_COLORS.get(color.lower())
+            return default if rgb is None else rgb + (1.,)
+        try:
+            return to_rgba(color)
+        except ValueError:
+            return default
+    values = tuple(float(c) for c in color)
+    if max(values) > 1.:  # 0-255 integers
+        values = tuple(c / 255. for c in values)
+    return values if len(values) == 4 else values + (1.,)
+
+
+def transform_matrix(shape):
+    """4x4 matrix mapping local (homogeneous) coordinates of ``shape`` to
+    global coordinates, i.e. ``world = matrix @ (x, y, z, 1)``.
+
+    :rtype: numpy.ndarray
+    """
+    origin, axes = _frame(shape)
+    matrix = np.eye(4)
+    matrix[:3, :3] = axes.T
+    matrix[:3, 3] = origin
+    return matrix
+
+
+class InstanceBatch:
+    """One shared mesh drawn at many transforms.
+
+    :param str key: definition key shared by the shapes
+    :param Mesh mesh: mesh in the local frame
+    :param list shapes: the instanced shapes
+    """
+
+    def __init__(self, key, mesh, shapes):
+        self.key = key
+        self.mesh = mesh
+        self.shapes = shapes
+        #: (n, 4, 4) float32 transforms, row-major
+        self.transforms = np.array([transform_matrix(s) for s in shapes],
+                                   dtype=np.float32).reshape(-1, 4, 4)
+        #: (n, 4) float32 RGBA colors
+        self.colors = np.array(
+            [rgba(getattr(s, "color", None)) for s in shapes],
+            dtype=np.float32).reshape(-1, 4)
+
+    def __len__(self):
+        return len(self.shapes)
+
+    def __repr__(self):
+        return (f"InstanceBatch({len(self)} x {len(self.mesh.vertices)} "
+                f"vertices)")
+
+    @property
+    def mesh_nbytes(self):
+        return self.mesh.vertices.nbytes + self.mesh.triangles.nbytes
+
+    @property
+    def nbytes(self):
+        """Size of the mesh and instance buffers."""
+        return self.mesh_nbytes + self.transforms.nbytes + self.colors.nbytes
+
+    def update(self, indices=None):
+        """Re-reads the transforms and colors of the shapes at ``indices``
+        (all by default), e.g. after a position input changed. Shapes
+        defined in global coordinates get a new definition key when their
+        position changes; rebuild the batches for those.
+        """
+        if indices is None:
+            indices = range(len(self.shapes))
+        for i in indices:
+            self.transforms[i] = transform_matrix(self.shapes[i])
+            self.colors[i] = rgba(getattr(self.shapes[i], "color", None))
+
+
+def instance_batches(shapes, cache=None, lod="coarse", min_instances=2):
+    """Groups ``shapes`` with the same definition into instance batches.
+
+    :param shapes: ParaPy shapes, e.g. ``geometric_children(obj)``
+    :param TessellationCache cache: mesh cache, a new in-memory one by
+        default
+    :param str lod: level of detail of the shared meshes
+    :param int min_instances: smallest group drawn instanced
+    :return: the batches, and the shapes left to draw individually
+    :rtype: (list[InstanceBatch], list)
+    """
+    if cache is None:
+        cache = TessellationCache(store=False)
+    groups = OrderedDict()
+    for shape in shapes:
+        groups.setdefault(cache.key(shape, lod), []).append(shape)
+    batches, singles = [], []
+    for key, group in groups.items():
+        if len(group) < min_instances:
+            singles.extend(group)
+        else:
+            batches.append(InstanceBatch(key, cache.local_mesh(group[0], lod),
+                                         group))
+    return batches, singles
+
+
+def world_vertices(batch):
+    """Vertex stage of an instanced draw: the (n, v, 3) global vertices of
+    all instances of ``batch``, in a single vectorized operation.
+
+    :rtype: numpy.ndarray
+    """
+    local = batch.mesh.vertices.astype(np.float32)
+    rotation = batch.transforms[:, :3, :3]
+    translation = batch.transforms[:, :3, 3]
+    return np.einsum("nij,vj->nvi", rotation, local) + translation[:, None]
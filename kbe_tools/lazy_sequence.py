@@ -0,0 +1,98 @@
+"""Virtual sequences whose elements are built on demand.
+
+A quantified part builds all of its children as soon as the sequence is
+used, so ``len(obj.airfoils)`` or ``obj.airfoils[-1].chord`` cost as much as
+building every airfoil. A :class:`LazySequence` only knows its length and a
+factory ``factory(index) -> child``::
+
+    @Attribute
+    def airfoils(self):
+        return LazySequence(self.n_airfoils,
+                            lambda i: Airfoil(chord=0.1 * (i + 1)))
+
+Indexing builds one child, slicing returns a lazy view that shares the
+children already built, and iteration builds the children one at a time.
+A child stays available as long as it is referenced anywhere; besides that,
+only the ``cache_size`` most recently used children are kept alive. Memory
+therefore grows with the number of children in use, not with the length:
+a sequence of 10 ** 6 children costs nothing until it is indexed.
+"""
+
+from collections import OrderedDict
+from collections.abc import Sequence
+from weakref import WeakValueDictionary
+
+
+class _Children:
+    """Children built so far, shared by a sequence and its slices."""
+
+    def __init__(self, factory, cache_size):
+        self.factory = factory
+        self.cache_size = cache_size
+        #: every child that is still referenced somewhere
+        self.alive = WeakValueDictionary()
+        #: strong references to the most recently used children
+        self.recent = OrderedDict()
+        self.built = 0
+
+    def get(self, index):
+        child = self.alive.get(index)
+        if child is None:
+            child = self.factory(index)
+            self.built += 1
+            self.alive[index] = child
+        if self.cache_size:
+            self.recent[index] = child
+            self.recent.move_to_end(index)
+            if len(self.recent) > self.cache_size:
+                self.recent.popitem(last=False)
+        return child
+
+
+class LazySequence(Sequence):
+    """Sequence of ``length`` children built by ``factory(index)`` on first
+    access.
+
+    :param int length: number of children
+    :param factory: function building the child at an index; children must
+        support weak references (ParaPy objects do)
+    :param int cache_size: number of recently used children kept alive when
+        nothing else refers to them
+    """
+
+    def __init__(self, length, factory, cache_size=128):
+        self._indices = range(length)
+        self._children = _Children(factory, cache_size)
+
+    @classmethod
+    def _view(cls, children, indices):
+        view = cls.__new__(cls)
+        view._indices = indices
+        view._children = children
+        return view
+
+    def __repr__(self):
+        return (f"<LazySequence of {len(self)}, "
+                f"{len(self._children.alive)} children in memory>")
+
+    def __len__(self):
+        return len(self._indices)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._view(self._children, self._indices[index])
+        return self._children.get(self._indices[index])
+
+    def __iter__(self):
+        for index in self._indices:
+            yield self._children.get(index)
+
+    @property
+    def built(self):
+        """Number of children built so far, including rebuilt ones."""
+        return self._children.built
+
+    @property
+    def in_memory(self):
+        """Number of children currently in memory."""
+        return len(self._children.alive)
@@ -0,0 +1,238 @@
+"""Wave-wise and concurrent evaluation of independent parts.
+
+Overview classes such as ``BuildingSolids`` or ``BuildingSurfaces`` define
+dozens of sibling parts that do not depend on each other. The rules of a
+class are read once to find which slots each rule refers to
+(``self.<slot>``), which gives a static dependency graph, and the parts are
+evaluated in waves: all parts of a wave only depend on parts of earlier
+waves::
+
+    obj = BuildingSolids()
+    evaluate_parts(obj)                                 # serial, in obj
+    evaluate_parts(obj, n_workers=8, mode="process", task=volume)
+
+By default (``mode="serial"``) the parts and their shapes are built in
+``obj`` itself, one after another, wave by wave. This is the mode to use
+when the parts are needed afterwards, and the reference for the others.
+
+``mode="process"`` builds the parts in worker processes, as shapes cannot
+be moved between processes: every worker builds its own instance of the
+class from the input values of ``obj`` and returns ``task(part)`` for each
+part, e.g. a mesh or a mass property, which must be picklable. Nothing is
+built in ``obj``, and without a task the result is None for every part,
+which is only useful to time the build. A worker also builds the parts its
+part depends on in its own instance; it keeps that instance for its next
+jobs, but parts shared by jobs of different workers are built once per
+worker.
+
+``mode="thread"`` is experimental. It builds the parts of a wave in a pool
+of threads in ``obj`` itself, which can only pay off as far as the
+geometry kernel releases the GIL. ParaPy's bookkeeping of caches and
+dependencies is not thread-safe, not even for slots of different objects.
+The attributes that the parts of a wave depend on are evaluated serially
+before the wave is started, but the threads still run the rules of their
+own parts concurrently, so the resulting tree may have missing or wrong
+dependencies. Use it to measure what concurrency could gain, not to build
+a model that is used afterwards.
+
+With ``n_workers=1`` the modes ``"process"`` and ``"thread"`` start no pool
+and evaluate serially in ``obj``, as ``mode="serial"`` does.
+"""
+
+import ast
+import inspect
+import textwrap
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+
+from parapy.core import Base
+
+from kbe_tools.slots import (attribute_names, input_names, part_names,
+                             rule_function)
+
+
+def _referenced_names(func):
+    """Names ``x`` of all ``self.x`` expressions in the source of ``func``."""
+    try:
+        source = textwrap.dedent(inspect.getsource(func))
+    except (OSError, TypeError):
+        return set()
+    tree = ast.parse(source)
+    return {node.attr for node in ast.walk(tree)
+            if isinstance(node, ast.Attribute)
+            and isinstance(node.value, ast.Name) and node.value.id == "self"}
+
+
+@lru_cache(maxsize=None)
+def slot_dependencies(cls):
+    """Direct dependencies of the parts and attributes of ``cls`` on its
+    other parts and attributes. Inputs are left out: they are known.
+
+    :rtype: dict[str, frozenset[str]]
+    """
+    names = set(part_names(cls)) | set(attribute_names(cls))
+    deps = {}
+    for name in names:
+        func = rule_function(cls, name)
+        referenced = _referenced_names(func) if func is not None else set()
+        deps[name] = frozenset((referenced & names) - {name})
+    return deps
+
+
+def part_dependencies(cls):
+    """Dependencies of every part of ``cls`` on its other parts, following
+    the attributes in between (e.g. ``ruled_sld`` -> ``circles``).
+
+    :rtype: dict[str, set[str]]
+    """
+    deps = slot_dependencies(cls)
+    parts = set(part_names(cls))
+    result = {}
+    for name in parts:
+        seen, stack = set(), list(deps[name])
+        while stack:
+            dep = stack.pop()
+            if dep not in seen:
+                seen.add(dep)
+                if dep not in parts:  # look through attributes
+                    stack.extend(deps[dep])
+        result[name] = seen & parts
+    return result
+
+
+def waves(cls, names=None):
+    """The parts of ``cls`` (or ``names`` and the parts they depend on)
+    grouped in waves that can be evaluated concurrently, in order.
+
+    :rtype: list[list[str]]
+    """
+    deps = part_dependencies(cls)
+    todo, stack = set(), list(deps if names is None else names)
+    while stack:
+        name = stack.pop()
+        if name not in todo:
+            todo.add(name)
+            stack.extend(deps[name])
+    result, done = [], set()
+    while todo:
+        wave = sorted(name for name in todo if deps[name] <= done)
+        if not wave:
+            raise ValueError(f"circular dependency between parts "
+                             f"{sorted(todo)}")
+        result.append(wave)
+        done.update(wave)
+        todo.difference_update(wave)
+    return result
+
+
+def _nodes(value):
+    """``value`` and all objects below it, for single and quantified parts.
+    Suppressed parts (``Undefined``) have none.
+    """
+    if isinstance(value, Base):
+        stack = [value]
+    elif isinstance(value, Iterable):
+        stack = list(value)
+    else:
+        return
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(node.children)
+
+
+def build_part(obj, name):
+    """Evaluates part ``name`` of ``obj`` and the shapes in its subtree.
+
+    :return: the part (or sequence of parts)
+    """
+    value = getattr(obj, name)
+    for node in _nodes(value):
+        if hasattr(node, "TopoDS_Shape"):
+            node.TopoDS_Shape
+    return value
+
+
+#: model instance of the last class and inputs seen by a worker process
+_MODELS = {}
+
+
+def _build_in_process(cls, inputs, name, task):
+    """Worker function: builds part ``name`` of its own instance of ``cls``
+    and returns ``task(part)``, or None without a task.
+    """
+    key = (cls, repr(sorted(inputs.items())))
+    if key not in _MODELS:
+        _MODELS.clear()
+        _MODELS[key] = cls(**inputs)
+    part = build_part(_MODELS[key], name)
+    return None if task is None else task(part)
+
+
+def _attribute_closure(cls, names):
+    """The attributes that the slots ``names`` depend on, directly or
+    through other attributes, in an order in which they can be evaluated.
+
+    :rtype: list[str]
+    """
+    deps = slot_dependencies(cls)
+    parts = set(part_names(cls))
+    order, seen = [], set()
+
+    def visit(name):
+        for dep in sorted(deps[name] - parts):
+            if dep not in seen:
+                seen.add(dep)
+                visit(dep)
+                order.append(dep)
+
+    for name in names:
+        visit(name)
+    return order
+
+
+def evaluate_parts(obj, names=None, n_workers=None, mode="serial",
+                   task=None):
+    """Builds the parts of ``obj`` (all, or ``names`` and the parts they
+    depend on) wave by wave.
+
+    :param int n_workers: size of the pool for ``"process"`` and
+        ``"thread"``; 1 evaluates serially in ``obj``
+    :param str mode: ``"serial"``, ``"process"`` or ``"thread"``
+    :param task: function applied to each part; for ``"process"`` it runs
+        in the worker, so it must be defined at module level and its
+        results must be picklable
+    :return: dictionary of part name to ``task(part)``, or to the part
+        without a task, or to None in mode ``"process"`` without a task
+    :rtype: dict
+    """
+    if mode not in ("serial", "process", "thread"):
+        raise ValueError(f"unknown mode {mode!r}")
+    cls = type(obj)
+    result = {}
+    if mode == "serial" or n_workers == 1:
+        for wave in waves(cls, names):
+            for name in wave:
+                value = build_part(obj, name)
+                result[name] = task(value) if task else value
+    elif mode == "thread":
+        with ThreadPoolExecutor(n_workers) as pool:
+            for wave in waves(cls, names):
+                # evaluate the attributes shared by the wave beforehand
+                for name in _attribute_closure(cls, wave):
+                    getattr(obj, name)
+                built = pool.map(lambda name: build_part(obj, name), wave)
+                for name, value in zip(wave, built):
+                    result[name] = task(value) if task else value
+    else:
+        inputs = {name: getattr(obj, name) for name in input_names(cls)}
+        # every worker builds the dependencies of its parts itself, so the
+        # waves only give the order in which the jobs are submitted
+        todo = [name for wave in waves(cls, names) for name in wave]
+        with ProcessPoolExecutor(n_workers) as pool:
+            futures = [pool.submit(_build_in_process, cls, inputs, name, task)
+                       for name in todo]
+            for name, future in zip(todo, futures):
+                result[name] = future.result()
+    return result
@@ -0,0 +1,220 @@
+"""Opt-in persistent cache for expensive Attribute rules.
+
+ParaPy caches an Attribute per instance, in memory. Decorating the rule
+function with :func:`persistent` adds a second level below that cache: the
+result is stored on disk under a key made of the class, the attribute name,
+a hash of the rule's code and a hash of the inputs named in the decorator.
+A new process, or a sibling instance with identical inputs, then reads the
+stored value instead of recomputing it::
+
+    class Wing(Base):
+        taper = Input(0.2)
+        c_root = Input(4)
+
+        @Attribute
+        @persistent("c_root", "taper")
+        def c_tip(self):
+            print("I take 10 minutes to return")
+            return self.c_root * self.taper
+
+The store is a directory of pickle files whose total size is bounded; when
+it grows too large, the least recently used entries are evicted. Reading an
+entry unpickles it, which can run arbitrary code, so the directory must only
+be writable by the user: the default one is per user and created private.
+Do not point ``KBE_CACHE_DIR`` at a shared folder.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+from functools import wraps
+
+#: default location of the file store, can be set with the environment
+#: variable KBE_CACHE_DIR
+DEFAULT_DIRECTORY = os.environ.get(
+    "KBE_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".kbe_cache"))
+
+
+class FileStore:
+    """Directory of pickled values with size-bounded LRU eviction.
+
+    The modification time of a file doubles as its last access time, so the
+    least recently used order survives restarts of the process.
+
+    :param str directory: folder holding the entries, created when needed
+        and readable by the user only; its files are trusted
+    :param int max_bytes: total size above which entries are evicted
+    """
+
+    suffix = ".pkl"
+
+    def __init__(self, directory=DEFAULT_DIRECTORY, max_bytes=256 * 2 ** 20):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + self.suffix)
+
+    def get(self, key):
+        """Returns ``(True, value)`` for a stored key, ``(False, None)``
+        otherwise.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return False, None
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:
+            pass
+        return True, value
+
+    def put(self, key, value):
+        """Stores ``value`` under ``key``, then evicts entries if the store
+        exceeds ``max_bytes``. Values that cannot be pickled are silently not
+        stored.
+        """
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return
+        # write to a temporary file first, so readers never see half a file
+        fd, tmp = tempfile.mkstemp(dir=self.directory)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, self._path(key))
+        self.evict()
+
+    def entries(self):
+        """Stored entries as (modification time, size, path), oldest first."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(self.suffix):
+                try:
+                    stat = entry.stat()
+                except OSError:  # removed by another process meanwhile
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return sorted(entries)
+
+    def evict(self):
+        """Removes least recently used entries until the store fits in
+        ``max_bytes``.
+        """
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+    def clear(self):
+        """Removes all entries."""
+        for _, _, path in self.entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+_default_store = None
+
+
+def default_store():
+    """The FileStore used when :func:`persistent` gets no explicit store."""
+    global _default_store
+    if _default_store is None:
+        _default_store = FileStore()
+    return _default_store
+
+
+def input_hash(values):
+    """Stable hash of a tuple of resolved input values.
+
+    :raises TypeError: if a value cannot be pickled; its ``repr`` is no
+        substitute, as it often holds an ``id`` that differs between runs
+    :rtype: str
+    """
+    try:
+        data = pickle.dumps(values, protocol=4)
+    except (pickle.PicklingError, TypeError, AttributeError) as error:
+        raise TypeError(f"cannot hash input values {values!r} for the "
+                        f"persistent cache: {error}") from error
+    return hashlib.sha256(data).hexdigest()
+
+
+def code_hash(func):
+    """Hash of the bytecode, constants and names of ``func``, including
+    nested functions and comprehensions, so editing the rule changes it.
+
+    :rtype: str
+    """
+    digest = hashlib.sha256()
+
+    def add(code):
+        digest.update(code.co_code)
+        digest.update(repr(code.co_names).encode())
+        for const in code.co_consts:
+            if hasattr(const, "co_code"):
+                add(const)
+            else:
+                digest.update(repr(const).encode())
+
+    add(func.__code__)
+    return digest.hexdigest()
+
+
+def cache_key(obj, name, inputs, version=""):
+    """Key of attribute ``name`` of ``obj``, given the names of the inputs
+    the attribute depends on and a version of its rule, e.g.
+    :func:`code_hash`.
+
+    :rtype: str
+    """
+    cls = type(obj)
+    values = tuple(getattr(obj, input_name) for input_name in inputs)
+    identity = f"{cls.__module__}.{cls.__qualname__}.{name}.{version}"
+    return hashlib.sha256(
+        f"{identity}:{input_hash(values)}".encode()).hexdigest()
+
+
+def persistent(*inputs, store=None, version=None):
+    """Decorator for the rule function of an Attribute that stores its
+    result in a persistent :class:`FileStore`.
+
+    :param inputs: names of the slots the result depends on. They must be
+        given explicitly: the attribute then only depends on these in
+        ParaPy, and instances that differ in unrelated inputs (such as
+        ``label``) share the result
+    :param FileStore store: store to use, defaults to :func:`default_store`
+    :param str version: version of the rule in the key; by default the
+        :func:`code_hash` of the rule, so stored results of an edited rule
+        are not reused. Bump an explicit version when the rule's result
+        changes through code it calls
+    """
+    if not inputs:
+        raise TypeError("persistent() needs the names of the inputs the "
+                        "result depends on")
+
+    def decorator(func):
+        rule_version = version if version is not None else code_hash(func)
+
+        @wraps(func)
+        def wrapper(self):
+            key = cache_key(self, func.__name__, inputs, rule_version)
+            file_store = store or default_store()
+            hit, value = file_store.get(key)
+            if not hit:
+                value = func(self)
+                file_store.put(key, value)
+            return value
+        return wrapper
+    return decorator
@@ -0,0 +1,89 @@
+"""Compact, array-backed sequence of points.
+
+A list of ParaPy ``Point`` objects costs one Python object (and its three
+floats) per point. A :class:`PointCloud` keeps all coordinates in a single
+contiguous float64 array of shape (n, 3), or (m, n, 3) for a grid of control
+points, and only creates a ``Point`` when an element is accessed. As it is a
+regular sequence of Points (or, for grids, of rows of Points) it can be given
+wherever the geometry classes expect points, e.g.
+``BSplineCurve(control_points=cloud)`` or ``BSplineSurface(control_points=
+grid)``.
+"""
+
+from collections.abc import Sequence
+
+import numpy as np
+from parapy.geom import Point
+
+
+class PointCloud(Sequence):
+    """Sequence of points backed by a float64 array whose last dimension
+    holds the x, y and z coordinates.
+
+    :param coords: (n, 3) or (m, n, 3) array-like. NumPy float64 arrays are
+        used as they are, without copying
+    """
+
+    def __init__(self, coords):
+        coords = np.asarray(coords, dtype=np.float64)
+        if coords.ndim < 2 or coords.shape[-1] != 3:
+            raise ValueError(f"expected an array of shape (..., 3), got "
+                             f"{coords.shape}")
+        self.coords = coords
+
+    @classmethod
+    def from_array(cls, array):
+        """Zero-copy view of a NumPy array (copies only if the array is not
+        float64).
+
+        :rtype: PointCloud
+        """
+        return cls(array)
+
+    @classmethod
+    def from_coords(cls, data):
+        """From nested tuples/lists of coordinates, such as the
+        ``pt_coords_list`` or ``data`` inputs, in a single conversion. A
+        PointCloud or NumPy array (e.g. a memory-mapped grid) is used without
+        copying.
+
+        :rtype: PointCloud
+        """
+        if isinstance(data, PointCloud):
+            return data
+        if isinstance(data, np.ndarray):
+            return cls(data)
+        return cls(np.array(data, dtype=np.float64))
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is None or np.dtype(dtype) == self.coords.dtype:
+            return self.coords.copy() if copy else self.coords
+        return self.coords.astype(dtype)
+
+    def __repr__(self):
+        return f"PointCloud(shape={self.shape})"
+
+    @property
+    def shape(self):
+        return self.coords.shape
+
+    @property
+    def nbytes(self):
+        return self.coords.nbytes
+
+    def __len__(self):
+        return len(self.coords)
+
+    def __getitem__(self, index):
+        item = self.coords[index]
+        if item.ndim == 1:
+            return Point(*item.tolist())
+        return PointCloud(item)
+
+    def __iter__(self):
+        if self.coords.ndim == 2:
+            for x, y, z in self.coords.tolist():
+                yield Point(x, y, z)
+        else:
+            for row in self.coords:
+                yield PointCloud(row)
@@ -0,0 +1,131 @@
+"""Interning of attribute results shared by instances with identical inputs.
+
+A quantified part such as ``Aircraft.propulsion_sys`` creates ``n`` children
+whose inputs are all the same, and every child computes the same values.
+When sharing is enabled, rule functions decorated with :func:`shared` look
+up their result in an interning table keyed by the class, the attribute name
+and the input values. The first instance computes the value; all other
+instances with the same configuration get the stored one, so memory and
+evaluation time grow with the number of distinct configurations::
+
+    class Engine(Base):
+        radius = Input()
+        length = Input()
+
+        @Attribute
+        @shared("radius", "length")
+        def volume(self):
+            ...
+
+Sharing is off by default; switch it on with :func:`enable_sharing` or, for
+a block of code, ``with sharing(): ...``.
+"""
+
+from contextlib import contextmanager
+from functools import wraps
+
+from kbe_tools.persistent_cache import input_hash
+from kbe_tools.slots import input_names
+
+
+class InternTable:
+    """Table of shared results, one per distinct (class, attribute, inputs)
+    key.
+    """
+
+    def __init__(self):
+        self.values = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.values)
+
+    def get_or_compute(self, key, compute):
+        """Returns the value stored under ``key``; calls ``compute()`` and
+        stores its result if there is none yet.
+        """
+        try:
+            value = self.values[key]
+        except KeyError:
+            self.misses += 1
+            value = self.values[key] = compute()
+        else:
+            self.hits += 1
+        return value
+
+    def clear(self):
+        self.values.clear()
+        self.hits = self.misses = 0
+
+
+#: the interning table used by default
+TABLE = InternTable()
+
+_enabled = False
+
+
+def enable_sharing(flag=True):
+    """Switches result sharing on (or off, with ``flag=False``)."""
+    global _enabled
+    _enabled = flag
+
+
+def sharing_enabled():
+    """:rtype: bool"""
+    return _enabled
+
+
+@contextmanager
+def sharing(table=TABLE):
+    """Enables result sharing within a ``with`` block. The table is cleared
+    on exit, unless sharing was already enabled before.
+    """
+    was_enabled = _enabled
+    enable_sharing(True)
+    try:
+        yield table
+    finally:
+        enable_sharing(was_enabled)
+        if not was_enabled:
+            table.clear()
+
+
+def _key(obj, name, inputs):
+    values = tuple(getattr(obj, input_name) for input_name in inputs)
+    try:
+        hash(values)
+    except TypeError:  # e.g. lists as input values
+        values = input_hash(values)
+    # the class object itself, not its name: tutorial modules redefine
+    # classes with the same name
+    return type(obj), name, values
+
+
+def shared_value(obj, name, inputs, table=TABLE):
+    """Value of attribute ``name`` of ``obj``, shared between all instances
+    of the same class whose ``inputs`` have the same values. Useful for
+    children whose class cannot be decorated, such as the ``Box`` wagons of
+    ``Train``.
+    """
+    if not _enabled:
+        return getattr(obj, name)
+    return table.get_or_compute(_key(obj, name, inputs),
+                                lambda: getattr(obj, name))
+
+
+def shared(*inputs, table=TABLE):
+    """Decorator for the rule function of an Attribute whose result only
+    depends on ``inputs`` (by default: all Input slots of the class) and
+    can therefore be shared between instances while sharing is enabled.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(self):
+            if not _enabled:
+                return func(self)
+            names = inputs or input_names(type(self))
+            return table.get_or_compute(_key(self, func.__name__, names),
+                                        lambda: func(self))
+        return wrapper
+    return decorator
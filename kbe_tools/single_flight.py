@@ -0,0 +1,157 @@
+"""Single-flight evaluation of slots read by several threads at once.
+
+When several threads read a slot that is not cached yet, each of them runs
+its rule, and so do the rules of every slot it depends on. With
+:func:`single_flight` the first thread to read a slot of an instance (the
+leader) runs the rule; threads reading the same slot of the same instance
+meanwhile (the followers) wait for that evaluation and get its result (or
+its exception). Locking is per (instance, slot), so different slots and
+different instances are still evaluated concurrently::
+
+    class Aircraft(Base):
+
+        @Attribute
+        @single_flight
+        def volume(self):
+            ...
+
+:func:`install` applies the same to all attributes and parts of existing
+classes without editing them. The rule of a quantified part runs once per
+child, so part evaluations are keyed per child, on (instance, slot,
+``child.index``).
+
+ParaPy records the dependencies of a slot on the slots its rule reads. A
+follower that only returned the value of the leader would read none, so
+once the leader is done the follower runs the rule again: the slots it
+reads are all cached by then, so this only repeats the rule body itself,
+and ParaPy records the same dependencies as for the leader. The follower
+still returns the value of the leader, so all threads get the same object;
+for a part, the child its own run creates is dropped.
+:func:`following` tells such a repeated run from an evaluation.
+
+Because waiting only happens on a slot that is being evaluated, and a rule
+only waits on the slots it depends on, there is no deadlock as long as the
+slots do not depend on each other in a cycle (which ParaPy rejects anyway).
+A thread that re-enters a slot it is evaluating itself does not wait, so
+such a cycle is still reported by ParaPy rather than hanging.
+"""
+
+import inspect
+import threading
+from functools import wraps
+
+from parapy.core import child
+
+from kbe_tools.slots import attribute_names, part_names, rule_attribute
+
+
+class _Flight:
+    """One evaluation in progress, shared by the threads reading the slot."""
+
+    __slots__ = ("thread", "done", "value", "error")
+
+    def __init__(self):
+        self.thread = threading.get_ident()
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+#: evaluations in progress, keyed on (id(instance), slot name, child index)
+_FLIGHTS = {}
+_FLIGHTS_LOCK = threading.Lock()
+#: key of the rule a follower runs again, per thread
+_FOLLOWING = threading.local()
+
+
+def flight_key(obj, name, part=False):
+    """Key of an evaluation of slot ``name`` of ``obj``. For a part it holds
+    the index of the child whose rule is running (None outside the rule of
+    a quantified part).
+
+    :rtype: tuple
+    """
+    index = None
+    if part:
+        try:
+            index = child.index
+        except Exception:  # no child is being built
+            pass
+    return id(obj), name, index
+
+
+def following(key):
+    """Whether the current thread runs the rule of ``key`` (see
+    :func:`flight_key`) again as a follower, rather than evaluating it.
+
+    :rtype: bool
+    """
+    return getattr(_FOLLOWING, "key", None) == key
+
+
+def single_flight(func, part=False):
+    """Decorator for the rule function of an Attribute (or of a Part, with
+    ``part=True``): concurrent reads of the slot on one instance, and of
+    one child for a part, share a single evaluation.
+    """
+    name = func.__name__
+
+    @wraps(func)
+    def wrapper(self):
+        key = flight_key(self, name, part)
+        with _FLIGHTS_LOCK:
+            flight = _FLIGHTS.get(key)
+            leader = flight is None
+            if leader:
+                flight = _FLIGHTS[key] = _Flight()
+        if not leader:
+            if flight.thread == threading.get_ident():
+                return func(self)  # re-entered: let ParaPy report the cycle
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            # run the rule again so that ParaPy records its dependencies
+            previous, _FOLLOWING.key = getattr(_FOLLOWING, "key", None), key
+            try:
+                func(self)
+            finally:
+                _FOLLOWING.key = previous
+            return flight.value
+        try:
+            flight.value = func(self)
+            return flight.value
+        except BaseException as error:
+            flight.error = error
+            raise
+        finally:
+            with _FLIGHTS_LOCK:
+                del _FLIGHTS[key]
+            flight.done.set()
+
+    wrapper.__wrapped__ = func
+    return wrapper
+
+
+def install(*classes):
+    """Makes all attributes and parts of ``classes`` single-flight, in place.
+
+    :return: function that restores the original rules
+    """
+    patches, seen = [], set()
+    for cls in classes:
+        parts = set(part_names(cls))
+        for name in attribute_names(cls) + part_names(cls):
+            slot = inspect.getattr_static(cls, name)
+            attr = rule_attribute(slot, name)
+            if attr is None or id(slot) in seen:
+                continue
+            seen.add(id(slot))
+            func = getattr(slot, attr)
+            patches.append((slot, attr, func))
+            setattr(slot, attr, single_flight(func, part=name in parts))
+
+    def uninstall():
+        for slot, attr, func in reversed(patches):
+            setattr(slot, attr, func)
+
+    return uninstall
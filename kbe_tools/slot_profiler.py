@@ -0,0 +1,272 @@
+"""Per-slot profiler for ParaPy product trees.
+
+While a :class:`SlotProfiler` is active, every read of an Input, Attribute or
+Part slot on instances of the profiled classes is recorded. Per slot (class
+name + slot name, summed over all instances) it keeps:
+
+* ``accesses``: number of reads;
+* ``evaluations``: number of times the rule was actually run;
+* ``hits``: reads served from the cache (accesses - evaluations);
+* ``invalidations``: evaluations of a slot that had been evaluated before on
+  the same instance, i.e. after a change of one of its inputs;
+* ``cumulative`` and ``self`` time of the evaluations, in seconds;
+* ``dependencies``: the slots read while evaluating it (its fan-out).
+
+Usage::
+
+    with SlotProfiler(Aircraft, Engine, Nacelle, Fuselage, Wing) as prof:
+        obj = Aircraft()
+        obj.volume
+    print(prof.report())
+    prof.write_folded("aircraft.folded")  # input for flamegraph.pl/speedscope
+
+The profiler patches ``__getattribute__`` of the profiled classes and wraps
+the rule functions it can find on their slots; everything is restored by
+:meth:`SlotProfiler.stop`. For slots whose rule function cannot be wrapped, a
+read counts as an evaluation when it is the first one on the instance or when
+it reads other slots (a cached value does not).
+"""
+
+import inspect
+import threading
+import weakref
+from collections import defaultdict
+from functools import wraps
+from time import perf_counter
+
+from kbe_tools.slots import (attribute_names, input_names, part_names,
+                             rule_attribute)
+
+
+class SlotStats:
+    """Counters of a single slot."""
+
+    __slots__ = ("accesses", "evaluations", "invalidations", "cumulative",
+                 "self_time", "dependencies")
+
+    def __init__(self):
+        self.accesses = 0
+        self.evaluations = 0
+        self.invalidations = 0
+        self.cumulative = 0.
+        self.self_time = 0.
+        self.dependencies = set()
+
+    @property
+    def hits(self):
+        return self.accesses - self.evaluations
+
+    @property
+    def hit_ratio(self):
+        return self.hits / self.accesses if self.accesses else 0.
+
+    @property
+    def fan_out(self):
+        return len(self.dependencies)
+
+
+class _Frame:
+    __slots__ = ("key", "obj", "child_time", "evaluated", "read_slots")
+
+    def __init__(self, key, obj):
+        self.key = key
+        self.obj = obj
+        self.child_time = 0.
+        self.evaluated = False
+        self.read_slots = False
+
+
+class SlotProfiler:
+    """Records slot evaluations of instances of ``classes``.
+
+    :param classes: ParaPy classes to profile, e.g. all classes that occur in
+        a model tree
+    """
+
+    def __init__(self, *classes):
+        self.classes = classes
+        self.stats = defaultdict(SlotStats)
+        #: self time per call stack, in the "folded" flame graph format
+        self.stacks = defaultdict(float)
+        #: slots evaluated per instance, as id -> (weak reference, keys); the
+        #: reference tells a reused id of a collected instance apart
+        self._evaluated = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._patches = []
+        self._hooked = set()
+        self._inputs = set()
+
+    # ---- switching on and off ----------------------------------------------
+
+    def start(self):
+        """Instruments the profiled classes."""
+        if self._patches:
+            return
+        # resolve the original __getattribute__ of every class before any of
+        # them is patched, so a patched superclass is never called twice
+        originals = [(cls, cls.__getattribute__) for cls in self.classes]
+        hooked = set()
+        for cls, original in originals:
+            rules = attribute_names(cls) + part_names(cls)
+            names = frozenset(input_names(cls) + rules)
+            self._inputs.update((cls.__name__, name)
+                                for name in input_names(cls))
+            self._patches.append(
+                (cls, "__getattribute__", vars(cls).get("__getattribute__")))
+            cls.__getattribute__ = self._make_getattribute(names, original)
+            for name in rules:
+                slot = inspect.getattr_static(cls, name)
+                attr = rule_attribute(slot, name)
+                if attr is None:
+                    continue
+                self._hooked.add((cls.__name__, name))
+                if id(slot) not in hooked:  # inherited by several classes
+                    hooked.add(id(slot))
+                    func = getattr(slot, attr)
+                    self._patches.append((slot, attr, func))
+                    setattr(slot, attr, self._wrap_rule(func))
+
+    def stop(self):
+        """Removes all instrumentation."""
+        for target, attr, original in reversed(self._patches):
+            if original is None:
+                delattr(target, attr)
+            else:
+                setattr(target, attr, original)
+        self._patches = []
+        self._hooked.clear()
+        self._inputs.clear()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def reset(self):
+        """Clears all recorded data."""
+        with self._lock:
+            self.stats.clear()
+            self.stacks.clear()
+            self._evaluated.clear()
+
+    # ---- instrumentation ---------------------------------------------------
+
+    @property
+    def _stack(self):
+        try:
+            return self._local.stack
+        except AttributeError:
+            stack = self._local.stack = []
+            return stack
+
+    def _make_getattribute(self, names, original):
+        profiler = self
+
+        def __getattribute__(obj, name):
+            if name not in names:
+                return original(obj, name)
+            return profiler._read(obj, name, original)
+        return __getattribute__
+
+    def _wrap_rule(self, func):
+        profiler = self
+
+        @wraps(func)
+        def rule(*args, **kwargs):
+            stack = profiler._stack
+            if stack:
+                stack[-1].evaluated = True
+            return func(*args, **kwargs)
+        return rule
+
+    def _read(self, obj, name, original):
+        key = (type(obj).__name__, name)
+        stack = self._stack
+        frame = _Frame(key, obj)
+        if stack:
+            stack[-1].read_slots = True
+            with self._lock:
+                self.stats[stack[-1].key].dependencies.add(key)
+        stack.append(frame)
+        start = perf_counter()
+        try:
+            return original(obj, name)
+        finally:
+            elapsed = perf_counter() - start
+            stack.pop()
+            if stack:
+                stack[-1].child_time += elapsed
+            self._record(frame, elapsed, stack)
+
+    def _evaluated_slots(self, obj):
+        """Keys of the slots evaluated before on ``obj``."""
+        entry = self._evaluated.get(id(obj))
+        if entry is None or entry[0]() is not obj:
+            try:
+                ref = weakref.ref(obj)
+            except TypeError:  # no weak references: keep the object alive
+                ref = lambda: obj
+            entry = self._evaluated[id(obj)] = (ref, set())
+        return entry[1]
+
+    def _record(self, frame, elapsed, stack):
+        with self._lock:
+            stats = self.stats[frame.key]
+            stats.accesses += 1
+            if frame.key in self._inputs:
+                return
+            evaluated_slots = self._evaluated_slots(frame.obj)
+            if frame.key in self._hooked:
+                evaluated = frame.evaluated
+            else:
+                evaluated = (frame.evaluated or frame.read_slots or
+                             frame.key not in evaluated_slots)
+            if not evaluated:
+                return
+            stats.evaluations += 1
+            if frame.key in evaluated_slots:
+                stats.invalidations += 1
+            evaluated_slots.add(frame.key)
+            self_time = elapsed - frame.child_time
+            stats.cumulative += elapsed
+            stats.self_time += self_time
+            path = ";".join("{}.{}".format(*f.key) for f in stack + [frame])
+            self.stacks[path] += self_time
+
+    # ---- output ------------------------------------------------------------
+
+    def report(self, sort="cumulative", limit=None):
+        """Text table of all slots, sorted on ``sort`` (``"cumulative"``,
+        ``"self_time"``, ``"evaluations"``, ``"accesses"``, ``"hits"``,
+        ``"invalidations"`` or ``"fan_out"``), highest first.
+
+        :rtype: str
+        """
+        rows = sorted(self.stats.items(),
+                      key=lambda item: getattr(item[1], sort), reverse=True)
+        if limit is not None:
+            rows = rows[:limit]
+        lines = [f"{'slot':<40}{'evals':>8}{'hits':>8}{'hit %':>8}"
+                 f"{'inval':>8}{'cum ms':>11}{'self ms':>11}{'fan-out':>9}"]
+        for (cls_name, name), s in rows:
+            lines.append(f"{cls_name + '.' + name:<40}{s.evaluations:>8}"
+                         f"{s.hits:>8}{100 * s.hit_ratio:>8.1f}"
+                         f"{s.invalidations:>8}{1e3 * s.cumulative:>11.3f}"
+                         f"{1e3 * s.self_time:>11.3f}{s.fan_out:>9}")
+        return "\n".join(lines)
+
+    def folded(self):
+        """Self time per call stack in the folded format used by flame graph
+        tools (flamegraph.pl, speedscope, ...), in microseconds.
+
+        :rtype: str
+        """
+        return "\n".join(f"{path} {max(1, round(1e6 * t))}"
+                         for path, t in sorted(self.stacks.items()))
+
+    def write_folded(self, path):
+        with open(path, "w") as f:
+            f.write(self.folded() + "\n")
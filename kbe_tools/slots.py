@@ -0,0 +1,153 @@
+"""Introspection of the slots (inputs, attributes and parts) that a ParaPy
+class defines.
+"""
+
+import inspect
+import re
+from inspect import getattr_static
+
+from parapy.core import Attribute, Input, Part
+
+#: one step of a slot path: a slot name with an optional child index
+_PATH_STEP = re.compile(r"(\w+)(?:\[(\d+)\])?")
+
+
+def _slots_of_type(cls, slot_type, exclude=()):
+    names = []
+    for klass in reversed(cls.__mro__):
+        names.extend(name for name in vars(klass) if name not in names)
+    # the definition in the most derived class wins
+    slots = ((name, getattr_static(cls, name)) for name in names)
+    return [name for name, slot in slots
+            if isinstance(slot, slot_type) and not isinstance(slot, exclude)]
+
+
+def input_names(cls):
+    """Names of all Input slots of ``cls``, including inherited ones.
+
+    :rtype: list[str]
+    """
+    return _slots_of_type(cls, Input)
+
+
+def part_names(cls):
+    """Names of all Part slots of ``cls``, including inherited ones.
+
+    :rtype: list[str]
+    """
+    return _slots_of_type(cls, Part, exclude=Input)
+
+
+def attribute_names(cls):
+    """Names of all Attribute slots of ``cls`` that are neither an Input nor
+    a Part, including inherited ones.
+
+    :rtype: list[str]
+    """
+    return _slots_of_type(cls, Attribute, exclude=(Input, Part))
+
+
+def rule_attribute(slot, name):
+    """Name of the attribute of the slot object ``slot`` that holds the rule
+    function of slot ``name``, or None if there is no such attribute (e.g.
+    for plain inputs).
+    """
+    try:
+        items = vars(slot).items()
+    except TypeError:  # no __dict__
+        return None
+    for attr, value in items:
+        if inspect.isfunction(value) and value.__name__ == name:
+            return attr
+    return None
+
+
+def rule_function(cls, name):
+    """The function that defines the rule of slot ``name`` of ``cls``, or
+    None if it cannot be found (e.g. for plain inputs).
+    """
+    slot = getattr_static(cls, name)
+    attr = rule_attribute(slot, name)
+    return None if attr is None else getattr(slot, attr)
+
+
+def same_value(a, b):
+    """Whether ``a`` and ``b`` are the same input value: equal and of the
+    same type. Values that cannot be compared (e.g. arrays) are only the
+    same if they are identical.
+    """
+    if a is b:
+        return True
+    try:
+        return bool(a == b) and type(a) is type(b)
+    except (TypeError, ValueError):
+        return False
+
+
+def explicit_inputs(obj):
+    """Values of the inputs of ``obj`` that were set rather than defaulted,
+    as found by comparing them with a new instance of its class.
+
+    Plain inputs are compared first; inputs whose default is a rule (e.g.
+    ``c_tip = c_root * taper``) follow in definition order, each compared
+    with an instance that has the explicit inputs found so far, so that a
+    default computed from them is not taken for a set value. An input set
+    to its default value is left out, which gives the same model.
+
+    :rtype: dict
+    """
+    cls = type(obj)
+    names = sorted(input_names(cls),
+                   key=lambda name: rule_function(cls, name) is not None)
+    explicit, fresh = {}, cls()
+    for name in names:
+        value = getattr(obj, name)
+        try:
+            default = getattr(fresh, name)
+            is_default = same_value(value, default)
+        except Exception:  # an input without default
+            is_default = False
+        if not is_default:
+            explicit[name] = value
+            fresh = cls(**explicit)
+    return explicit
+
+
+def get_path(obj, path):
+    """The value at the slot path ``path`` below ``obj``: slot names joined
+    by dots, with an index for a child of a quantified part, e.g.
+    ``"wing.area"`` or ``"steps[3].position"``.
+
+    :raises ValueError: if ``path`` is not of that form
+    """
+    for step in path.split("."):
+        match = _PATH_STEP.fullmatch(step)
+        if match is None:
+            raise ValueError(f"invalid slot path {path!r} at {step!r}")
+        name, index = match.groups()
+        obj = getattr(obj, name)
+        if index:
+            obj = obj[int(index)]
+    return obj
+
+
+def _owner(obj, path):
+    owner, _, name = path.rpartition(".")
+    if not name.isidentifier():
+        raise ValueError(f"invalid input path {path!r} at {name!r}")
+    return (get_path(obj, owner) if owner else obj), name
+
+
+def set_path(obj, path, value):
+    """Sets the input at the slot path ``path`` below ``obj``."""
+    owner, name = _owner(obj, path)
+    setattr(owner, name, value)
+
+
+def reset_path(obj, path):
+    """Unsets the input at the slot path ``path`` below ``obj``: deleting an
+    input makes ParaPy fall back to its default, or to the value passed
+    down by the parent.
+    """
+    owner, name = _owner(obj, path)
+    delattr(owner, name)
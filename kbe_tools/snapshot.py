@@ -0,0 +1,151 @@
+"""Snapshots of the results of evaluated product trees.
+
+Regenerating the shapes of a model such as ``BuildingSolids`` (fillets,
+sweeps, lofts) at every process start is expensive. :func:`save_snapshot`
+writes a single zip file holding the set inputs of the root, the values
+of selected attributes and the kernel shapes of selected parts in the
+native OpenCASCADE BRep format::
+
+    save_snapshot(obj, "solids.snapshot",
+                  attributes=["circles"], parts=["*_sld"])
+
+    snapshot = Snapshot("solids.snapshot")      # reads the index only
+    shape = snapshot.shape("filleted_sld")      # deserialized on first use
+
+Opening a snapshot only reads its index; each shape is read from the archive
+and deserialized when it is first asked for, and then kept.
+
+Nothing is restored into a product tree. ParaPy does not allow storing a
+value in the cache of a rule from outside, so the stored values and shapes
+are only served by the :class:`Snapshot`, e.g. to display, mesh or export
+them without rebuilding the model. :meth:`Snapshot.model` creates a new
+model with the stored inputs, which evaluates its slots and builds its
+shapes from scratch when they are read; a warm start through the model is
+no faster than a cold one.
+"""
+
+import os
+import pickle
+import tempfile
+import zipfile
+
+from kbe_tools.export import load_class, select_parts
+from kbe_tools.slots import explicit_inputs, get_path
+
+#: format version of the snapshot files
+VERSION = 1
+
+
+def write_brep(topo_shape):
+    """The native BRep representation of an OpenCASCADE shape.
+
+    :rtype: bytes
+    """
+    from OCC.Core.BRepTools import breptools_Write
+    handle, filename = tempfile.mkstemp(suffix=".brep")
+    os.close(handle)
+    try:
+        breptools_Write(topo_shape, filename)
+        with open(filename, "rb") as f:
+            return f.read()
+    finally:
+        os.remove(filename)
+
+
+def read_brep(data):
+    """OpenCASCADE shape from its native BRep representation."""
+    from OCC.Core.BRep import BRep_Builder
+    from OCC.Core.BRepTools import breptools_Read
+    from OCC.Core.TopoDS import TopoDS_Shape
+    handle, filename = tempfile.mkstemp(suffix=".brep")
+    try:
+        with os.fdopen(handle, "wb") as f:
+            f.write(data)
+        shape = TopoDS_Shape()
+        breptools_Read(shape, filename, BRep_Builder())
+        return shape
+    finally:
+        os.remove(filename)
+
+
+def save_snapshot(obj, path, attributes=(), parts=("*",)):
+    """Writes the set inputs of ``obj`` (see
+    :func:`kbe_tools.slots.explicit_inputs`), the values at the slot paths
+    ``attributes`` and the shapes of the parts matching ``parts`` (see
+    :func:`kbe_tools.export.select_parts`) to the file ``path``. Values
+    must be picklable; shapes that are not evaluated yet are evaluated.
+    """
+    cls = type(obj)
+    state = {"version": VERSION,
+             "class": f"{cls.__module__}:{cls.__qualname__}",
+             "inputs": explicit_inputs(obj),
+             "attributes": {name: get_path(obj, name) for name in attributes},
+             "shapes": {}}
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for i, part_path in enumerate(select_parts(obj, parts)):
+            member = f"shapes/{i}.brep"
+            archive.writestr(member, write_brep(
+                get_path(obj, part_path).TopoDS_Shape))
+            state["shapes"][part_path] = member
+        archive.writestr("state.pickle", pickle.dumps(state))
+
+
+class Snapshot:
+    """Snapshot written by :func:`save_snapshot`, with its shapes read on
+    first use.
+
+    :param str path: snapshot file
+    """
+
+    def __init__(self, path):
+        self.archive = zipfile.ZipFile(path)
+        self.state = pickle.loads(self.archive.read("state.pickle"))
+        if self.state["version"] != VERSION:
+            raise ValueError(f"{path} has snapshot version "
+                             f"{self.state['version']}, expected {VERSION}")
+        self._shapes = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.archive.close()
+
+    @property
+    def cls(self):
+        """The class of the root of the snapshot."""
+        return load_class(self.state["class"])
+
+    @property
+    def inputs(self):
+        return self.state["inputs"]
+
+    @property
+    def attributes(self):
+        """Attribute values by slot path."""
+        return self.state["attributes"]
+
+    @property
+    def shape_paths(self):
+        """Paths of the parts whose shape is stored."""
+        return list(self.state["shapes"])
+
+    def model(self, **inputs):
+        """New instance of the root class with the stored inputs, updated
+        with ``inputs``. Nothing of the snapshot is restored into it: its
+        slots and shapes are evaluated anew, use :meth:`shape` and
+        :attr:`attributes` for the stored results.
+        """
+        return self.cls(**dict(self.inputs, **inputs))
+
+    def shape(self, path):
+        """The OpenCASCADE shape of the part at ``path``, deserialized on
+        the first call.
+        """
+        if path not in self._shapes:
+            member = self.state["shapes"][path]
+            self._shapes[path] = read_brep(self.archive.read(member))
+        return self._shapes[path]
@@ -0,0 +1,243 @@
+"""Bounding volume hierarchy over the shapes of a product tree.
+
+Proximity queries such as "which curve is nearest to this point" are
+answered by brute force when every shape is projected on. A :class:`BVH`
+groups the axis-aligned bounding boxes of the shapes in a binary tree, so
+nearest-shape, within-radius and ray queries only visit the branches whose
+boxes can still contain an answer (logarithmic in the number of shapes for
+well-distributed geometry). The exact distance, e.g. a projection on a
+curve, is only computed for the candidates that survive the box test::
+
+    index = BVH(geometric_children(obj),
+                distance=lambda crv, pt: crv.projected_point(pt)["distance"])
+    crv, d = index.nearest(Point(-10, 0, 0))
+
+The boxes are read and the hierarchy is built when the index is created.
+In the rule of a ParaPy attribute, that records the ``bbox`` of every shape
+as a dependency of the attribute, so the index is built anew when a shape
+changes; queries do not read the boxes again. An index kept outside of a
+slot is not told about changes: after the inputs of a shape changed,
+:meth:`BVH.update` refits the boxes on the path from its leaf to the root
+only, and :meth:`BVH.rebuild` starts over.
+"""
+
+import heapq
+from math import inf
+
+import numpy as np
+from parapy.geom import GeomBase, Point
+
+
+def shape_bbox(shape):
+    """(lower, upper) corners of the bounding box of a ParaPy shape.
+
+    :rtype: (numpy.ndarray, numpy.ndarray)
+    """
+    bbox = shape.bbox
+    return (np.array([bbox.xmin, bbox.ymin, bbox.zmin], dtype=float),
+            np.array([bbox.xmax, bbox.ymax, bbox.zmax], dtype=float))
+
+
+def geometric_children(root):
+    """All objects below ``root`` in the product tree (depth first) that are
+    shapes, i.e. GeomBase instances with a bounding box.
+
+    :rtype: list
+    """
+    shapes = []
+    stack = list(reversed(root.children))
+    while stack:
+        node = stack.pop()
+        if isinstance(node, GeomBase) and hasattr(node, "bbox"):
+            shapes.append(node)
+        stack.extend(reversed(node.children))
+    return shapes
+
+
+def _box_distance2(lo, hi, point):
+    """Squared distance from ``point`` to the box(es) [lo, hi]."""
+    d = np.maximum(np.maximum(lo - point, point - hi), 0.)
+    return np.einsum("...k,...k->...", d, d)
+
+
+class BVH:
+    """Bounding volume hierarchy over ``items``.
+
+    :param items: shapes to index
+    :param bbox: function returning the (lower, upper) box of an item
+    :param distance: function ``distance(item, Point)`` returning the exact
+        distance; by default the distance to the box is used
+    :param int leaf_size: maximum number of items per leaf
+    """
+
+    def __init__(self, items, bbox=shape_bbox, distance=None, leaf_size=4):
+        self.items = list(items)
+        self.bbox = bbox
+        self.distance = distance
+        self.leaf_size = leaf_size
+        self._build()
+
+    def __len__(self):
+        return len(self.items)
+
+    # ---- construction ------------------------------------------------------
+
+    def rebuild(self):
+        """Re-reads all boxes and builds the hierarchy anew."""
+        self._build()
+
+    def _build(self):
+        n = len(self.items)
+        boxes = [self.bbox(item) for item in self.items]
+        self.lo = np.array([b[0] for b in boxes]).reshape(n, 3)
+        self.hi = np.array([b[1] for b in boxes]).reshape(n, 3)
+        self.order = np.arange(n)
+        # nodes: box, children (-1 for leaves), range in self.order, parent
+        self.node_lo, self.node_hi = [], []
+        self.left, self.right, self.start, self.stop = [], [], [], []
+        self.parent = []
+        self.leaf_of = np.empty(n, dtype=int)
+        if n:
+            self._build_node(0, n, -1)
+        self.node_lo = np.array(self.node_lo)
+        self.node_hi = np.array(self.node_hi)
+
+    def _build_node(self, start, stop, parent):
+        node = len(self.left)
+        idx = self.order[start:stop]
+        self.node_lo.append(self.lo[idx].min(axis=0))
+        self.node_hi.append(self.hi[idx].max(axis=0))
+        self.left.append(-1)
+        self.right.append(-1)
+        self.start.append(start)
+        self.stop.append(stop)
+        self.parent.append(parent)
+        if stop - start <= self.leaf_size:
+            self.leaf_of[idx] = node
+            return node
+        # split at the median of the box centers along the longest axis
+        centers = self.lo[idx] + self.hi[idx]
+        axis = np.argmax(centers.max(axis=0) - centers.min(axis=0))
+        mid = (stop - start) // 2
+        part = np.argpartition(centers[:, axis], mid)
+        self.order[start:stop] = idx[part]
+        self.left[node] = self._build_node(start, start + mid, node)
+        self.right[node] = self._build_node(start + mid, stop, node)
+        return node
+
+    def update(self, item):
+        """Re-reads the box of ``item`` and refits the boxes of its leaf and
+        all ancestors. Use after the inputs of ``item`` changed.
+        """
+        i = self.items.index(item)
+        self.lo[i], self.hi[i] = self.bbox(item)
+        node = self.leaf_of[i]
+        while node != -1:
+            if self.left[node] == -1:
+                idx = self.order[self.start[node]:self.stop[node]]
+                lo, hi = self.lo[idx].min(axis=0), self.hi[idx].max(axis=0)
+            else:
+                children = [self.left[node], self.right[node]]
+                lo = self.node_lo[children].min(axis=0)
+                hi = self.node_hi[children].max(axis=0)
+            self.node_lo[node], self.node_hi[node] = lo, hi
+            node = self.parent[node]
+
+    # ---- queries -----------------------------------------------------------
+
+    def _exact(self, i, point):
+        if self.distance is None:
+            return float(np.sqrt(_box_distance2(self.lo[i], self.hi[i],
+                                                point)))
+        return self.distance(self.items[i], Point(*point.tolist()))
+
+    def nearest(self, point, k=1):
+        """The ``k`` items nearest to ``point``, as (item, distance) pairs,
+        nearest first. For ``k=1`` a single pair is returned.
+        """
+        if not self.items:
+            return None if k == 1 else []
+        point = np.array(tuple(point), dtype=float)
+        found = []  # max-heap of (-distance, item index)
+
+        def worst():
+            return -found[0][0] if len(found) == k else inf
+
+        queue = [(_box_distance2(self.node_lo[0], self.node_hi[0], point), 0)]
+        while queue:
+            bound2, node = heapq.heappop(queue)
+            if bound2 > worst() ** 2:
+                break  # no remaining box can hold anything nearer
+            if self.left[node] == -1:
+                for i in self.order[self.start[node]:self.stop[node]]:
+                    if _box_distance2(self.lo[i], self.hi[i],
+                                      point) > worst() ** 2:
+                        continue
+                    d = self._exact(i, point)
+                    if len(found) < k:
+                        heapq.heappush(found, (-d, i))
+                    elif d < worst():
+                        heapq.heapreplace(found, (-d, i))
+            else:
+                for c in (self.left[node], self.right[node]):
+                    heapq.heappush(queue, (_box_distance2(
+                        self.node_lo[c], self.node_hi[c], point), c))
+        result = [(self.items[i], -d) for d, i in sorted(found, reverse=True)]
+        return result[0] if k == 1 else result
+
+    def within(self, point, radius):
+        """All (item, distance) pairs within ``radius`` of ``point``,
+        nearest first.
+        """
+        point = np.array(tuple(point), dtype=float)
+        r2, result, stack = radius ** 2, [], [0] if self.items else []
+        while stack:
+            node = stack.pop()
+            if _box_distance2(self.node_lo[node], self.node_hi[node],
+                              point) > r2:
+                continue
+            if self.left[node] == -1:
+                for i in self.order[self.start[node]:self.stop[node]]:
+                    if _box_distance2(self.lo[i], self.hi[i], point) <= r2:
+                        d = self._exact(i, point)
+                        if d <= radius:
+                            result.append((d, i))
+            else:
+                stack.extend((self.left[node], self.right[node]))
+        return [(self.items[i], d) for d, i in sorted(result)]
+
+    def ray(self, origin, direction, max_distance=inf):
+        """Items whose bounding box is hit by the ray, as (item, t) pairs
+        sorted on the entry parameter ``t`` along the (normalized) direction.
+        The boxes are a pre-filter: intersect the shapes themselves to get
+        the exact hits.
+        """
+        origin = np.array(tuple(origin), dtype=float)
+        direction = np.array(tuple(direction), dtype=float)
+        direction /= np.linalg.norm(direction)
+        with np.errstate(divide="ignore"):
+            inv = 1. / direction
+
+        def entry(lo, hi):
+            with np.errstate(invalid="ignore"):
+                t1, t2 = (lo - origin) * inv, (hi - origin) * inv
+            t1, t2 = np.nan_to_num(t1, nan=-inf), np.nan_to_num(t2, nan=inf)
+            t_in = np.minimum(t1, t2).max()
+            t_out = np.maximum(t1, t2).min()
+            if t_out < max(t_in, 0.) or t_in > max_distance:
+                return None
+            return float(max(t_in, 0.))
+
+        result, stack = [], [0] if self.items else []
+        while stack:
+            node = stack.pop()
+            if entry(self.node_lo[node], self.node_hi[node]) is None:
+                continue
+            if self.left[node] == -1:
+                for i in self.order[self.start[node]:self.stop[node]]:
+                    t = entry(self.lo[i], self.hi[i])
+                    if t is not None:
+                        result.append((t, i))
+            else:
+                stack.extend((self.left[node], self.right[node]))
+        return [(self.items[i], t) for t, i in sorted(result)]
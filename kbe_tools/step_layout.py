@@ -0,0 +1,163 @@
+"""Closed-form, array-backed layout of the steps of a staircase.
+
+Instead of one ``translate``/``rotate`` call (and one new ``Position``) per
+step, a :class:`StepLayout` computes the locations and orientations of all
+steps at once as NumPy arrays: an (n, 3) array of origins and an (n, 3, 3)
+array of rotations, whose rows are the local x, y and z axes of each step.
+A ``Position`` is only created when a step asks for it, e.g. by
+``self.positions[child.index]``.
+
+Staircases defined step by step (``child.previous``) follow a recurrence
+``pos[i] = T(pos[i - 1])`` with one fixed rigid motion ``T``.
+:meth:`StepLayout.recurrence` evaluates all powers ``T**i`` with a parallel
+prefix scan, so any step is then available in O(1) from its index, without
+evaluating the steps before it.
+"""
+
+from collections.abc import Sequence
+
+import numpy as np
+from parapy.geom import Orientation, Point, Position, Vector
+
+
+def position_arrays(position):
+    """Origin (3,) and axes (3, 3) of a ParaPy Position, as arrays.
+
+    :rtype: (numpy.ndarray, numpy.ndarray)
+    """
+    origin = np.array(tuple(position.location), dtype=float)
+    axes = np.array([tuple(position.Vx), tuple(position.Vy),
+                     tuple(position.Vz)], dtype=float)
+    return origin, axes
+
+
+def to_position(origin, axes):
+    """ParaPy Position from an origin and a (3, 3) array of axes.
+
+    :rtype: parapy.geom.Position
+    """
+    x, y, z = (Vector(*row) for row in axes.tolist())
+    return Position(Point(*origin.tolist()), Orientation(x=x, y=y, z=z))
+
+
+def rotation_matrix(axis, angle):
+    """(3, 3) matrix of a rotation over ``angle`` (radians) around ``axis``.
+
+    :rtype: numpy.ndarray
+    """
+    k = np.array(tuple(axis), dtype=float)
+    k = k / np.linalg.norm(k)
+    kx = np.array([[0., -k[2], k[1]],
+                   [k[2], 0., -k[0]],
+                   [-k[1], k[0], 0.]])
+    return np.eye(3) + np.sin(angle) * kx + (1 - np.cos(angle)) * kx @ kx
+
+
+def matrix_powers(matrix, n):
+    """``matrix ** i`` for ``i = 0 .. n - 1`` as an (n, m, m) array.
+
+    The powers are built by doubling: from the first k powers, the next k
+    follow from a single batched product with ``matrix ** k``. This takes
+    log2(n) NumPy operations instead of n Python iterations.
+
+    :rtype: numpy.ndarray
+    """
+    m = len(matrix)
+    powers = np.empty((n, m, m))
+    if n == 0:
+        return powers
+    powers[0] = np.eye(m)
+    k, step = 1, np.asarray(matrix, dtype=float)
+    while k < n:
+        count = min(k, n - k)
+        powers[k:k + count] = step @ powers[:count]
+        step = step @ step
+        k += count
+    return powers
+
+
+class StepLayout(Sequence):
+    """Read-only sequence of step positions backed by arrays.
+
+    :param numpy.ndarray origins: (n, 3) step locations
+    :param numpy.ndarray rotations: (n, 3, 3) step axes, one row per axis
+    """
+
+    def __init__(self, origins, rotations):
+        self.origins = origins
+        self.rotations = rotations
+        self._positions = {}
+
+    def __len__(self):
+        return len(self.origins)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return StepLayout(self.origins[index], self.rotations[index])
+        n = len(self)
+        if not -n <= index < n:
+            raise IndexError(f"step index {index} out of range")
+        index %= n
+        try:
+            return self._positions[index]
+        except KeyError:
+            pos = self._positions[index] = to_position(self.origins[index],
+                                                       self.rotations[index])
+            return pos
+
+    @classmethod
+    def straight(cls, position, n, dy, dz):
+        """Step ``i`` is ``translate(position, 'y', i * dy, 'z', i * dz)``.
+
+        :rtype: StepLayout
+        """
+        origin, axes = position_arrays(position)
+        i = np.arange(n, dtype=float)[:, None]
+        origins = origin + i * (dy * axes[1] + dz * axes[2])
+        # all steps share the orientation of the staircase: a read-only view
+        rotations = np.broadcast_to(axes, (n, 3, 3))
+        return cls(origins, rotations)
+
+    @classmethod
+    def spiral(cls, position, n, radius, angle_step, dz):
+        """Step ``i`` is ``translate(rotate(position, 'z', i * angle_step),
+        'x', radius, 'z', i * dz)``.
+
+        :rtype: StepLayout
+        """
+        origin, axes = position_arrays(position)
+        angles = np.arange(n) * angle_step
+        cos, sin = np.cos(angles)[:, None], np.sin(angles)[:, None]
+        vx, vy, vz = axes
+        x = cos * vx + sin * vy
+        y = -sin * vx + cos * vy
+        z = np.broadcast_to(vz, (n, 3))
+        rotations = np.stack([x, y, z], axis=1)
+        origins = origin + radius * x + np.arange(n)[:, None] * dz * vz
+        return cls(origins, rotations)
+
+    @classmethod
+    def recurrence(cls, first, n, translation=(0, 0, 0), axis=None,
+                   angle=0., center=(0, 0, 0)):
+        """Closed form of the recurrence ``pos[0] = first``,
+        ``pos[i] = T(pos[i - 1])``, where the rigid motion ``T`` rotates over
+        ``angle`` around ``axis`` through ``center``, then translates over
+        ``translation`` (all in global coordinates).
+
+        :rtype: StepLayout
+        """
+        transform = np.eye(4)
+        if axis is not None and angle:
+            rot = rotation_matrix(axis, angle)
+            center = np.array(tuple(center), dtype=float)
+            transform[:3, :3] = rot
+            transform[:3, 3] = center - rot @ center
+        transform[:3, 3] += tuple(translation)
+        powers = matrix_powers(transform, n)
+
+        origin, axes = position_arrays(first)
+        rot, shift = powers[:, :3, :3], powers[:, :3, 3]
+        origins = rot @ origin + shift
+        # every row of the axes array rotates along: axes @ rot^T
+        rotations = axes @ rot.transpose(0, 2, 1)
+        return cls(origins, rotations)
@@ -0,0 +1,216 @@
+"""Tessellation cache with levels of detail and on-disk persistence.
+
+Meshing every shape of a large model is CPU-bound and is repeated at every
+launch, even for shapes that are identical apart from their position, such
+as the steps of a staircase. A :class:`TessellationCache` keys a mesh on the
+shape definition (class and geometric inputs, but not display settings) and
+on the level of detail. Meshes are stored in the local frame of the shape's
+position, and for primitives defined in that frame (boxes, cylinders, ...)
+the position is left out of the key, so every identical primitive shares one
+mesh. Shapes defined in global coordinates keep their position in the key. Meshes
+are persisted in a :class:`~kbe_tools.persistent_cache.FileStore`, so a new
+process loads them from disk instead of meshing again::
+
+    cache = TessellationCache()
+    for step in obj.steps:
+        mesh = cache.mesh(step, lod="coarse")   # global coordinates
+
+Levels of detail are linear deflections relative to the diagonal of the
+shape's bounding box.
+"""
+
+import hashlib
+import os
+from collections import namedtuple
+
+import numpy as np
+from parapy.core import Base
+
+from kbe_tools.persistent_cache import DEFAULT_DIRECTORY, FileStore, input_hash
+from kbe_tools.slots import input_names
+
+#: triangle mesh: (n, 3) float vertices and (m, 3) int vertex indices
+Mesh = namedtuple("Mesh", ["vertices", "triangles"])
+
+#: inputs that do not change the geometry of a shape in its local frame
+NON_GEOMETRIC_INPUTS = frozenset([
+    "position", "label", "color", "colour", "transparency", "hidden",
+    "suppress", "display_mode", "isos", "line_thickness", "line_color",
+    "line_style", "point_size", "mesh_deflection"])
+
+
+#: names of the classes whose geometry is defined in the local frame of
+#: their ``position``; other shapes (curves through points, lofts, shapes
+#: built from other shapes, ...) are defined in global coordinates
+LOCAL_FRAME_CLASSES = frozenset([
+    "Box", "Cube", "Cylinder", "Cone", "Sphere", "Torus", "Wedge", "Circle",
+    "Ellipse", "Rectangle"])
+
+
+def defined_in_local_frame(cls):
+    """Whether shapes of ``cls`` that only differ in ``position`` have the
+    same geometry in the local frame of their position.
+
+    :rtype: bool
+    """
+    return any(klass.__name__ in LOCAL_FRAME_CLASSES for klass in cls.__mro__)
+
+
+def definition_key(obj, _depth=0):
+    """Hash of the geometric definition of ``obj``: its class and the values
+    of its geometric inputs. Inputs that are themselves ParaPy objects (e.g.
+    ``built_from``) contribute their own definition key. The position is
+    left out only for classes in :data:`LOCAL_FRAME_CLASSES`.
+
+    :rtype: str
+    """
+    cls = type(obj)
+    values = []
+    if not defined_in_local_frame(cls):
+        values.append(("position", _frame_key(obj)))
+    for name in input_names(cls):
+        if name in NON_GEOMETRIC_INPUTS:
+            continue
+        value = getattr(obj, name)
+        if isinstance(value, Base):
+            if _depth > 10:
+                raise ValueError("input chain too deep to derive a key")
+            value = ("definition", definition_key(value, _depth + 1),
+                     _frame_key(value))
+        values.append((name, value))
+    identity = f"{cls.__module__}.{cls.__qualname__}"
+    return hashlib.sha256(
+        f"{identity}:{input_hash(tuple(values))}".encode()).hexdigest()
+
+
+def _frame(shape):
+    """Origin (3,) and axes (3, 3, one row per axis) of the shape position."""
+    position = shape.position
+    origin = np.array(tuple(position.location), dtype=float)
+    axes = np.array([tuple(position.Vx), tuple(position.Vy),
+                     tuple(position.Vz)], dtype=float)
+    return origin, axes
+
+
+def _frame_key(obj):
+    """Rounded position of ``obj``, for objects used as input of a shape."""
+    try:
+        origin, axes = _frame(obj)
+    except AttributeError:  # not positioned
+        return None
+    return tuple(np.round(np.concatenate([origin, axes.ravel()]),
+                          12).tolist())
+
+
+def occ_mesher(shape, deflection):
+    """Meshes the OpenCASCADE shape of a ParaPy shape.
+
+    :rtype: Mesh
+    """
+    from OCC.Core.BRep import BRep_Tool
+    from OCC.Core.BRepMesh import BRepMesh_IncrementalMesh
+    from OCC.Core.TopAbs import TopAbs_FACE, TopAbs_REVERSED
+    from OCC.Core.TopExp import TopExp_Explorer
+    from OCC.Core.TopLoc import TopLoc_Location
+    from OCC.Core.TopoDS import topods
+
+    topo_shape = shape.TopoDS_Shape
+    BRepMesh_IncrementalMesh(topo_shape, deflection, False, 0.5, True)
+    vertices, triangles = [], []
+    explorer = TopExp_Explorer(topo_shape, TopAbs_FACE)
+    while explorer.More():
+        face = topods.Face(explorer.Current())
+        location = TopLoc_Location()
+        triangulation = BRep_Tool.Triangulation(face, location)
+        if triangulation is not None:
+            trsf = location.Transformation()
+            offset = len(vertices)
+            for i in range(1, triangulation.NbNodes() + 1):
+                pnt = triangulation.Node(i).Transformed(trsf)
+                vertices.append((pnt.X(), pnt.Y(), pnt.Z()))
+            flip = face.Orientation() == TopAbs_REVERSED
+            for i in range(1, triangulation.NbTriangles() + 1):
+                a, b, c = triangulation.Triangle(i).Get()
+                if flip:
+                    b, c = c, b
+                triangles.append((offset + a - 1, offset + b - 1,
+                                  offset + c - 1))
+        explorer.Next()
+    return Mesh(np.array(vertices, dtype=float).reshape(-1, 3),
+                np.array(triangles, dtype=np.int32).reshape(-1, 3))
+
+
+class TessellationCache:
+    """Shared, persistent meshes of ParaPy shapes.
+
+    :param FileStore store: on-disk store, by default a ``tessellation``
+        folder in the default cache directory. Pass False to keep meshes in
+        memory only
+    :param mesher: function ``mesher(shape, deflection) -> Mesh``
+    :param dict lods: relative linear deflection per level of detail
+    """
+
+    LODS = {"coarse": 5e-3, "medium": 1e-3, "fine": 2e-4}
+
+    def __init__(self, store=None, mesher=occ_mesher, lods=None):
+        if store is None:
+            store = FileStore(os.path.join(DEFAULT_DIRECTORY, "tessellation"),
+                              max_bytes=2 * 2 ** 30)
+        self.store = store
+        self.mesher = mesher
+        self.lods = dict(lods or self.LODS)
+        self.meshes = {}
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, shape, lod):
+        """Cache key of ``shape`` at level of detail ``lod``.
+
+        :rtype: str
+        """
+        return f"{definition_key(shape)}-{lod}-{self.lods[lod]:g}"
+
+    def local_mesh(self, shape, lod="medium"):
+        """Mesh of ``shape`` in the local frame of its position, shared by
+        all shapes with the same definition.
+
+        :rtype: Mesh
+        """
+        key = self.key(shape, lod)
+        mesh = self.meshes.get(key)
+        if mesh is None and self.store:
+            found, mesh = self.store.get(key)
+            if not found:
+                mesh = None
+        if mesh is None:
+            self.misses += 1
+            origin, axes = _frame(shape)
+            bbox = shape.bbox
+            diagonal = np.linalg.norm(
+                [bbox.xmax - bbox.xmin, bbox.ymax - bbox.ymin,
+                 bbox.zmax - bbox.zmin]) or 1.
+            world = self.mesher(shape, self.lods[lod] * diagonal)
+            mesh = Mesh((world.vertices - origin) @ axes.T, world.triangles)
+            if self.store:
+                self.store.put(key, mesh)
+        else:
+            self.hits += 1
+        self.meshes[key] = mesh
+        return mesh
+
+    def mesh(self, shape, lod="medium"):
+        """Mesh of ``shape`` in global coordinates.
+
+        :rtype: Mesh
+        """
+        local = self.local_mesh(shape, lod)
+        origin, axes = _frame(shape)
+        return Mesh(local.vertices @ axes + origin, local.triangles)
+
+    def warm(self, shapes, lods=("coarse", "medium", "fine")):
+        """Fills the cache for all ``shapes`` at the given levels of detail,
+        e.g. before exporting or displaying a model.
+        """
+        for shape in shapes:
+            for lod in lods:
+                self.local_mesh(shape, lod)
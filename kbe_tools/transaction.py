@@ -0,0 +1,113 @@
+"""Transactional updates of several inputs at once.
+
+An optimizer that changes ``span``, ``c_root``, ``c_tip`` and
+``n_of_engines`` one assignment at a time invalidates the dependent slots
+for every assignment, and whatever reads the model in between sees a mix of
+old and new inputs. A :class:`Transaction` collects the changes instead and
+applies them together at commit::
+
+    with transaction(obj) as tx:
+        tx["span"] = 40
+        tx["c_root"] = 6
+        tx["wing.c_tip"] = 1.5     # dotted paths reach into parts
+    obj.volume                     # one re-evaluation, with all new inputs
+
+At commit, repeated changes of one input are merged (the last one wins),
+changes to the current value are dropped, as they would invalidate the
+dependents for nothing, and :class:`~kbe_tools.validators.Validator` checks
+are deferred and run as one batch per validator. If a validator rejects a
+value, or an assignment raises, all inputs that were already set are
+restored, as set values or as unset (defaulted or passed-down) inputs like
+before, and the error is raised; leaving the ``with`` block with an
+exception discards the changes without applying any.
+
+The invalidation walk itself belongs to ParaPy and still happens per
+changed input. As the dependents are no longer evaluated after the first
+change, the later walks stop early, and nothing is evaluated between the
+changes, so the dependents are evaluated once, after the commit.
+"""
+
+from contextlib import contextmanager
+
+from kbe_tools.slots import get_path, reset_path, same_value, set_path
+from kbe_tools.validators import deferred_validation
+
+
+class Transaction:
+    """Pending input changes of the model ``obj``.
+
+    :param obj: root of the model; changes are given as (dotted) input
+        paths relative to it
+    """
+
+    def __init__(self, obj):
+        self.obj = obj
+        self.changes = {}
+        self.committed = False
+
+    def __setitem__(self, path, value):
+        if self.committed:
+            raise RuntimeError("transaction already committed")
+        self.changes.pop(path, None)  # keep the order of the last change
+        self.changes[path] = value
+
+    def __getitem__(self, path):
+        """The pending value of ``path``, or its current value."""
+        if path in self.changes:
+            return self.changes[path]
+        return get_path(self.obj, path)
+
+    def update(self, changes=(), **kwargs):
+        for path, value in dict(changes, **kwargs).items():
+            self[path] = value
+
+    def discard(self):
+        """Drops all pending changes."""
+        self.changes.clear()
+
+    def _restore(self, path, old):
+        """Undoes the change of ``path``. Assigning ``old`` would turn a
+        defaulted or passed-down input into a fixed one, so the input is
+        unset first and only set again if that does not give ``old``.
+        """
+        reset_path(self.obj, path)
+        if not same_value(get_path(self.obj, path), old):
+            set_path(self.obj, path, old)
+
+    def commit(self):
+        """Applies the pending changes, or none of them.
+
+        :return: the paths that were actually changed
+        :rtype: list[str]
+        """
+        if self.committed:
+            raise RuntimeError("transaction already committed")
+        old = {path: get_path(self.obj, path) for path in self.changes}
+        changed = [path for path, value in self.changes.items()
+                   if not same_value(old[path], value)]
+        applied = []
+        try:
+            with deferred_validation():
+                for path in changed:
+                    set_path(self.obj, path, self.changes[path])
+                    applied.append(path)
+        except BaseException:
+            for path in reversed(applied):
+                self._restore(path, old[path])
+            raise
+        self.committed = True
+        return changed
+
+
+@contextmanager
+def transaction(obj):
+    """Context manager yielding a :class:`Transaction` on ``obj`` that is
+    committed when the block ends normally and discarded otherwise.
+    """
+    tx = Transaction(obj)
+    try:
+        yield tx
+    except BaseException:
+        tx.discard()
+        raise
+    tx.commit()
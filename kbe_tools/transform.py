@@ -0,0 +1,147 @@
+"""Transform builder: chains of translate/rotate calls as one 4x4 matrix.
+
+A nested call such as::
+
+    rotate(translate(self.position, 'x', 3, 'y', 3), 'x', 10, deg=True)
+
+allocates an intermediate Position per call. The same chain can be recorded
+once, in the order the calls are applied, as a single homogeneous matrix::
+
+    move = Transform().translate('x', 3, 'y', 3).rotate('x', 10, deg=True)
+    move(self.position)          # same Position as the nested call
+
+and then be applied in one NumPy operation to whole arrays of positions or
+points. Like ParaPy's ``translate``/``rotate`` with axis names, directions
+and rotation axes are taken in the local frame of the position being moved,
+and rotations are about its own location. ParaPy takes directions given as
+a Vector in global coordinates instead, which depends on the position the
+chain is applied to; a Transform does not, so it only accepts axis names.
+"""
+
+import numpy as np
+
+from kbe_tools.step_layout import (
+    StepLayout, matrix_powers, position_arrays, rotation_matrix, to_position)
+
+_AXES = {"x": (1., 0., 0.), "y": (0., 1., 0.), "z": (0., 0., 1.)}
+
+
+def _direction(direction):
+    if not isinstance(direction, str):
+        raise TypeError(f"expected an axis name 'x', 'y' or 'z', got "
+                        f"{direction!r}: vector directions are global in "
+                        f"ParaPy and cannot be part of a Transform")
+    return np.array(_AXES[direction.lower()])
+
+
+def position_matrix(position):
+    """4x4 homogeneous matrix of a Position: its axes as the first three
+    columns, its location as the last one.
+
+    :rtype: numpy.ndarray
+    """
+    origin, axes = position_arrays(position)
+    matrix = np.eye(4)
+    matrix[:3, :3] = axes.T
+    matrix[:3, 3] = origin
+    return matrix
+
+
+class Transform:
+    """Rigid transformation built from translate and rotate steps. Every
+    step returns a new Transform, so partial chains can be reused.
+
+    :param numpy.ndarray matrix: 4x4 homogeneous matrix, identity by default
+    """
+
+    def __init__(self, matrix=None):
+        self.matrix = np.eye(4) if matrix is None else np.asarray(matrix)
+
+    def __repr__(self):
+        return f"Transform({self.matrix.tolist()})"
+
+    def __matmul__(self, other):
+        """``a @ b`` applies ``a`` first, then ``b``."""
+        return Transform(self.matrix @ other.matrix)
+
+    def translate(self, *args, **kwargs):
+        """Translation with the argument conventions of ParaPy's
+        ``translate``: ``translate('x', 1, 'y', 2)`` or ``translate(x=1)``.
+
+        :rtype: Transform
+        """
+        if len(args) % 2:
+            raise TypeError("expected (direction, distance) pairs")
+        step = np.eye(4)
+        pairs = list(zip(args[::2], args[1::2])) + list(kwargs.items())
+        for direction, distance in pairs:
+            step[:3, 3] += distance * _direction(direction)
+        return Transform(self.matrix @ step)
+
+    def rotate(self, axis, angle, deg=False):
+        """Rotation over ``angle`` around ``axis``, e.g. ``rotate('z', 90,
+        deg=True)``.
+
+        :rtype: Transform
+        """
+        if deg:
+            angle = np.radians(angle)
+        step = np.eye(4)
+        step[:3, :3] = rotation_matrix(_direction(axis), angle)
+        return Transform(self.matrix @ step)
+
+    def __call__(self, position):
+        """Applies the transform to a single Position.
+
+        :rtype: parapy.geom.Position
+        """
+        matrix = position_matrix(position) @ self.matrix
+        return to_position(matrix[:3, 3], matrix[:3, :3].T)
+
+    def apply(self, positions):
+        """Applies the transform to many positions in one operation.
+
+        :param positions: a StepLayout, a sequence of Positions, or an
+            (n, 4, 4) array of position matrices
+        :return: lazy sequence of the moved positions
+        :rtype: StepLayout
+        """
+        if isinstance(positions, StepLayout):
+            origins, rotations = positions.origins, positions.rotations
+        else:
+            if not isinstance(positions, np.ndarray):
+                positions = np.array([position_matrix(p) for p in positions])
+            origins = positions[:, :3, 3]
+            rotations = positions[:, :3, :3].transpose(0, 2, 1)
+        rot, shift = self.matrix[:3, :3], self.matrix[:3, 3]
+        # new location: origin + axes . shift; new axes (as rows): rot^T axes
+        new_origins = origins + np.einsum("nij,i->nj", rotations, shift)
+        new_rotations = np.einsum("ji,njk->nik", rot, rotations)
+        return StepLayout(new_origins, new_rotations)
+
+    def apply_to_points(self, points, frame=None):
+        """Moves points rigidly along with ``frame`` (the global frame by
+        default) when this transform is applied to that frame.
+
+        :param points: (n, 3) array or sequence of Points
+        :param frame: Position the points are attached to
+        :return: (n, 3) array of the moved points
+        :rtype: numpy.ndarray
+        """
+        points = np.asarray(points, dtype=float)
+        motion = self.matrix
+        if frame is not None:
+            base = position_matrix(frame)
+            motion = base @ motion @ np.linalg.inv(base)
+        return points @ motion[:3, :3].T + motion[:3, 3]
+
+    def series(self, first, n):
+        """Positions ``first``, ``self(first)``, ``self(self(first))``, ...
+        (``n`` in total), e.g. the wagons of a train.
+
+        :rtype: StepLayout
+        """
+        powers = matrix_powers(self.matrix, n)
+        matrices = position_matrix(first) @ powers
+        return StepLayout(matrices[:, :3, 3],
+                          matrices[:, :3, :3].transpose(0, 2, 1))
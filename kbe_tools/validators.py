@@ -0,0 +1,299 @@
+"""Fused input validators with batched and deferred checking.
+
+Validators are callables that return whether a value is valid, so they can
+be given as ``Input(validator=...)``. Predicates combine with ``&``, and the
+combination is compiled into one expression: bounds are merged into a single
+chained comparison, type checks into one ``isinstance`` and membership tests
+into one set lookup::
+
+    thickness = Input(0.2, validator=IsInstance(int, float) & GE(0.1)
+                      & LE(0.5))
+
+    validator.check_array(values)   # boolean mask, bounds in one NumPy pass
+
+Inside :func:`deferred_validation` a validator accepts every value and
+records it instead; all recorded values are then checked at once, in a batch
+per validator, when the block ends (the commit), and an error lists every
+invalid value::
+
+    with deferred_validation():
+        for value in candidates:
+            obj.thickness = value
+
+The values stay set when the deferred check fails; use a transaction to
+undo them.
+"""
+
+import operator
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+_LOCAL = threading.local()
+
+
+class Validator:
+    """Predicate on input values; combine with ``&``."""
+
+    #: fields merged when predicates are combined: lower and upper bound
+    #: with their inclusiveness, allowed types and allowed values
+    lower = upper = None
+    lower_inclusive = upper_inclusive = True
+    types = None
+    values = None
+
+    def __and__(self, other):
+        return All(self, other)
+
+    def __call__(self, value):
+        if getattr(_LOCAL, "trusted", False):
+            return True
+        pending = getattr(_LOCAL, "pending", None)
+        if pending is not None:
+            pending.append((self, value))
+            return True
+        return self.predicate(value)
+
+    @property
+    def predicate(self):
+        """The compiled predicate ``predicate(value) -> bool``."""
+        predicate = self.__dict__.get("_predicate")
+        if predicate is None:
+            predicate = self.__dict__["_predicate"] = self._compile()
+        return predicate
+
+    def _compile(self):
+        terms, namespace = [], {}
+        if self.types is not None:
+            namespace["types"] = self.types
+            terms.append("isinstance(value, types)")
+        if self.values is not None:
+            namespace["values"] = self.values
+            terms.append("value in values")
+        bounds = []
+        if self.lower is not None:
+            namespace["lower"] = self.lower
+            bounds.append("lower " + ("<=" if self.lower_inclusive else "<"))
+        bounds.append("value")
+        if self.upper is not None:
+            namespace["upper"] = self.upper
+            bounds.append(("<=" if self.upper_inclusive else "<") + " upper")
+        if len(bounds) > 1:
+            terms.append(" ".join(bounds))
+        source = f"lambda value: {' and '.join(terms) or 'True'}"
+        return eval(source, namespace)
+
+    def check_array(self, values):
+        """Check of all ``values`` at once: bounds and membership in one
+        NumPy pass for numbers. Types are decided once per array from its
+        dtype, and once per distinct type for other sequences, as the dtype
+        of an array of mixed numbers is their promoted type (``[1, 0.5]`` is
+        all floats). Strings and other objects are checked one by one, as
+        the objects they are.
+
+        :rtype: numpy.ndarray
+        """
+        array = np.asarray(values)
+        if array.dtype.kind not in "biuf":
+            return _each(self.predicate, values)
+        mask = np.ones(array.shape, dtype=bool)
+        if self.types is not None:
+            mask &= self._types_mask(values, array)
+        if self.values is not None:
+            mask &= np.isin(array, list(self.values))
+        if self.lower is not None:
+            compare = operator.ge if self.lower_inclusive else operator.gt
+            mask &= compare(array, self.lower)
+        if self.upper is not None:
+            compare = operator.le if self.upper_inclusive else operator.lt
+            mask &= compare(array, self.upper)
+        return mask
+
+    def _types_mask(self, values, array):
+        """Boolean mask of the values of numeric ``array`` that are of
+        ``self.types``, with ``values`` the sequence it was made from.
+        """
+        if isinstance(values, np.ndarray):
+            # the elements are taken as Python scalars, as in _each
+            return np.full(array.shape, issubclass(
+                _SCALAR_TYPES[array.dtype.kind], self.types))
+        elements = np.asarray(values, dtype=object).ravel()
+        valid = {t: issubclass(t, self.types)
+                 for t in set(map(type, elements))}
+        if len(set(valid.values())) == 1:
+            return np.full(array.shape, valid.popitem()[1])
+        return np.fromiter((valid[type(v)] for v in elements), dtype=bool,
+                           count=elements.size).reshape(array.shape)
+
+    def validate(self, value):
+        """Raises ValueError if ``value`` is invalid."""
+        if not self.predicate(value):
+            raise ValueError(f"{value!r} does not satisfy {self!r}")
+        return value
+
+
+#: Python type of the elements of a numeric array, by dtype kind
+_SCALAR_TYPES = {"b": bool, "i": int, "u": int, "f": float}
+
+
+def _each(predicate, values):
+    """Boolean mask of ``predicate`` applied to each of ``values``, taken as
+    the objects they are (the elements of an array as Python scalars).
+
+    :rtype: numpy.ndarray
+    """
+    values = np.asarray(values, dtype=object)
+    return np.fromiter((bool(predicate(v)) for v in values.ravel()),
+                       dtype=bool, count=values.size).reshape(values.shape)
+
+
+class GE(Validator):
+    def __init__(self, limit):
+        self.lower = limit
+
+    def __repr__(self):
+        return f"GE({self.lower!r})"
+
+
+class GT(Validator):
+    lower_inclusive = False
+
+    def __init__(self, limit):
+        self.lower = limit
+
+    def __repr__(self):
+        return f"GT({self.lower!r})"
+
+
+class LE(Validator):
+    def __init__(self, limit):
+        self.upper = limit
+
+    def __repr__(self):
+        return f"LE({self.upper!r})"
+
+
+class LT(Validator):
+    upper_inclusive = False
+
+    def __init__(self, limit):
+        self.upper = limit
+
+    def __repr__(self):
+        return f"LT({self.upper!r})"
+
+
+class In(Validator):
+    def __init__(self, values):
+        self.values = frozenset(values)
+
+    def __repr__(self):
+        return f"In({sorted(self.values, key=repr)!r})"
+
+
+class IsInstance(Validator):
+    def __init__(self, *types):
+        self.types = tuple(types)
+
+    def __repr__(self):
+        return f"IsInstance({', '.join(t.__name__ for t in self.types)})"
+
+
+class All(Validator):
+    """Conjunction of validators, merged into one predicate."""
+
+    def __init__(self, *validators):
+        self.parts = []
+        for validator in validators:
+            self.parts.extend(validator.parts
+                              if isinstance(validator, All) else [validator])
+        for part in self.parts:
+            self._merge(part)
+
+    def _merge(self, part):
+        if part.lower is not None and (
+                self.lower is None or part.lower > self.lower or
+                (part.lower == self.lower and not part.lower_inclusive)):
+            self.lower, self.lower_inclusive = part.lower, part.lower_inclusive
+        if part.upper is not None and (
+                self.upper is None or part.upper < self.upper or
+                (part.upper == self.upper and not part.upper_inclusive)):
+            self.upper, self.upper_inclusive = part.upper, part.upper_inclusive
+        if part.types is not None:
+            self.types = part.types if self.types is None else tuple(
+                [t for t in self.types if issubclass(t, part.types)] +
+                [t for t in part.types if issubclass(t, self.types)
+                 and t not in self.types])
+        if part.values is not None:
+            self.values = part.values if self.values is None \
+                else self.values & part.values
+
+    def __repr__(self):
+        return " & ".join(map(repr, self.parts))
+
+
+def check_array(validator, values):
+    """Boolean mask of the valid ``values`` for any validator: vectorized
+    for :class:`Validator` instances, element by element otherwise (e.g. for
+    ``parapy.core.val`` validators).
+
+    :rtype: numpy.ndarray
+    """
+    if isinstance(validator, Validator):
+        return validator.check_array(values)
+    return _each(validator, values)
+
+
+@contextmanager
+def deferred_validation():
+    """Defers the checks of :class:`Validator` instances in this thread to
+    the end of the block, where each validator checks all its recorded
+    values in one batch.
+
+    :raises ValueError: listing the invalid values, if any
+    """
+    if getattr(_LOCAL, "pending", None) is not None:
+        yield _LOCAL.pending  # nested: the outermost block validates
+        return
+    _LOCAL.pending = pending = []
+    try:
+        yield pending
+    finally:
+        _LOCAL.pending = None
+    batches = {}
+    for validator, value in pending:
+        batches.setdefault(id(validator), (validator, []))[1].append(value)
+    errors = []
+    for validator, values in batches.values():
+        try:
+            mask = validator.check_array(values)
+        except (TypeError, ValueError):  # values of mixed shapes
+            mask = [validator.predicate(value) for value in values]
+        errors.extend(f"{value!r} does not satisfy {validator!r}"
+                      for value, ok in zip(values, mask) if not ok)
+    if errors:
+        raise ValueError("invalid input values:\n" + "\n".join(errors))
+
+
+def set_many(objects, name, values, validator):
+    """Sets input ``name`` of each of ``objects`` to the matching value of
+    ``values``. All values are checked by ``validator`` in one batch first;
+    the per-set checks of :class:`Validator` instances are then skipped.
+
+    :raises ValueError: listing the invalid values; nothing is set then
+    """
+    values = list(values)
+    if len(values) != len(objects):
+        raise ValueError(f"{len(objects)} objects, but {len(values)} values")
+    mask = check_array(validator, values)
+    if not mask.all():
+        raise ValueError("invalid input values:\n" + "\n".join(
+            f"{values[i]!r} does not satisfy {validator!r}"
+            for i in np.flatnonzero(~mask)))
+    _LOCAL.trusted = True
+    try:
+        for obj, value in zip(objects, values):
+            setattr(obj, name, value)
+    finally:
+        _LOCAL.trusted = False
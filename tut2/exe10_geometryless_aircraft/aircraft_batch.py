@@ -0,0 +1,95 @@
+"""Batch (vectorized) evaluation of the geometryless Aircraft.
+
+The object model in aircraft_geometryless.py builds a full product tree per
+design point. For design-of-experiments sweeps with many input combinations
+the same rules are evaluated here on whole NumPy arrays at once, so no
+``Aircraft``, ``Fuselage``, ``Engine``, ``Nacelle`` or ``Wing`` has to be
+instantiated inside the loop.
+"""
+
+from math import pi
+
+import numpy as np
+
+from engine_geometryless import Nacelle
+
+
+def nacelle_volume():
+    """Volume of a single nacelle, taken from the object model itself so that
+    both evaluation modes can never drift apart.
+
+    :rtype: float
+    """
+    return Nacelle().volume
+
+
+def aircraft_batch(f_radius, f_length, e_radius, e_length, n_of_engines,
+                   span, c_root, c_tip, cl=None, v=None, rho=None):
+    """Evaluates ``volume``, ``wing.area``, ``wing.ar`` and (optionally) the
+    lift of many aircraft at once. All arguments are broadcast against each
+    other, so scalars and arrays can be mixed freely.
+
+    :param f_radius: fuselage radius
+    :param f_length: fuselage length
+    :param e_radius: engine radius
+    :param e_length: engine length
+    :param n_of_engines: number of engines
+    :param span: wing span
+    :param c_root: wing root chord
+    :param c_tip: wing tip chord
+    :param cl: lift coefficient, lift is only computed when cl, v and rho
+        are all given
+    :param v: speed in m / s
+    :param rho: density in kg / m^3
+    :return: dictionary with arrays for the keys "volume", "engines_volume",
+        "wing.area", "wing.ar" and, when requested, "lift"
+    :rtype: dict[str, numpy.ndarray]
+    """
+    f_radius, f_length, e_radius, e_length, n_of_engines, span, c_root, \
+        c_tip = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in
+                                      (f_radius, f_length, e_radius, e_length,
+                                       n_of_engines, span, c_root, c_tip)))
+
+    # same rules as Fuselage.volume, Engine.volume and Aircraft.volume
+    fuselage_volume = pi * (f_radius ** 2) * f_length
+    engine_volume = pi * (e_radius ** 2) * e_length + nacelle_volume()
+    engines_volume = n_of_engines * engine_volume
+
+    # same rules as Wing.area and Wing.ar
+    area = (c_root + c_tip) * 0.5 * span
+    ar = span ** 2 / area
+
+    result = {"volume": fuselage_volume + engines_volume,
+              "engines_volume": engines_volume,
+              "wing.area": area,
+              "wing.ar": ar}
+    if cl is not None and v is not None and rho is not None:
+        result["lift"] = 0.5 * np.asarray(cl) * rho * np.asarray(v) ** 2 * area
+    return result
+
+
+if __name__ == '__main__':
+    from aircraft_geometryless import Aircraft
+
+    # compare the batch mode against the object model for a small sweep
+    rng = np.random.default_rng(0)
+    n = 50
+    inputs = dict(f_radius=rng.uniform(2, 4, n),
+                  f_length=rng.uniform(40, 80, n),
+                  e_radius=rng.uniform(1, 2, n),
+                  e_length=rng.uniform(1.5, 3, n),
+                  n_of_engines=rng.integers(1, 5, n),
+                  span=rng.uniform(8, 40, n),
+                  c_root=rng.uniform(3, 6, n),
+                  c_tip=rng.uniform(1, 3, n))
+    batch = aircraft_batch(cl=0.5, v=120, rho=1.225, **inputs)
+
+    for i in range(n):
+        obj = Aircraft(**{key: value[i].item()
+                          for key, value in inputs.items()})
+        assert np.isclose(batch["volume"][i], obj.volume)
+        assert np.isclose(batch["engines_volume"][i], obj.engines_volume)
+        assert np.isclose(batch["wing.area"][i], obj.wing.area)
+        assert np.isclose(batch["wing.ar"][i], obj.wing.ar)
+        assert np.isclose(batch["lift"][i], obj.lift(0.5, 120, 1.225))
+    print(f"batch mode matches the object model for {n} design points")
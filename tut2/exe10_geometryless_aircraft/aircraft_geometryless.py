@@ -11,6 +11,7 @@
 # IMPLIED WARRANTIES OF MERCHANTABILITY AND/OR FITNESS FOR A PARTICULAR
 # PURPOSE.
 
+import numpy as np
 from parapy.core import Base, Input, Attribute, Part
 
 from wing_geometryless import Wing
@@ -112,6 +113,23 @@ class Aircraft(Base):
         """
         return 0.5 * cl * rho * v **2 * self.wing.area
 
+    def lift_grid(self, cl, v, rho, outer=False):
+        """Vectorized version of :meth:`lift`. The arguments can be scalars
+        or arrays that broadcast against each other; the (cached) wing area
+        is read only once for the whole grid.
+
+        :param cl: lift coefficient(s)
+        :param v: speed(s) in m / s
+        :param rho: density(ies) in kg / m^3
+        :param bool outer: if True, cl, v and rho are treated as 1D axes and
+            the full (len(cl), len(v), len(rho)) lift tensor is returned
+        :rtype: numpy.ndarray
+        """
+        cl, v, rho = (np.asarray(a, dtype=float) for a in (cl, v, rho))
+        if outer:
+            cl, v, rho = np.ix_(cl.ravel(), v.ravel(), rho.ravel())
+        return 0.5 * cl * rho * v ** 2 * self.wing.area
+
 
 # when the module is run as the main program, the interpreter /
 # kind of inserts this at the top of the module: __name__ = "__main__ /
@@ -127,8 +145,7 @@ if __name__ == '__main__':
                    e_radius=1.5, e_length=2, n_of_engines=4,
                    span=10.0, c_root=3, c_tip=2,
                    label="my_aircraft")  # Instantiate aircraft object
-    for cl in cl_lst:
-        print(obj.lift(cl, 120, 1.225))
+    print(obj.lift_grid(cl_lst, 120, 1.225))
 
     from parapy.gui import display
     display(obj)
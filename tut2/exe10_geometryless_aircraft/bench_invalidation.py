@@ -0,0 +1,188 @@
+"""Benchmark of the cost of input changes (invalidation and re-evaluation) on
+large product trees.
+
+Every case builds a wide or deep tree from the tutorial classes, evaluates it
+completely, then changes a single input and evaluates it again. The time of
+the assignment (the invalidation walk), the time of the re-evaluation and
+two slot counts from the SlotProfiler are stored as JSON:
+
+* ``reevaluated_stale``: slots that had been evaluated before the change and
+  were evaluated again afterwards, i.e. invalidated slots that were read
+  again. Slots that the invalidation walk clears but that are not read
+  again are not counted: ParaPy does not expose which slots it cleared;
+* ``reevaluated``: all evaluations after the change, including slots of
+  children that were created anew.
+
+::
+
+    python bench_invalidation.py --out results.json
+    python bench_invalidation.py --compare results.json
+
+With ``--compare`` the new run is checked against an earlier one and every
+case whose time grew more than ``--tolerance`` or whose slot counts changed
+is reported as a regression.
+"""
+
+import argparse
+import json
+import platform
+import sys
+from datetime import datetime
+from timeit import default_timer as timer
+
+from parapy.core import Attribute
+from parapy.geom import Box
+
+from kbe_tools.slot_profiler import SlotProfiler
+from tut2.exe8_9_classes_and_slots_exercises.parapy_slots import Airfoil, Wing
+from tut3.other_exercises_4_to_8.exe_5_6_staircase import (
+    StairCase, StairCase2, SpiralStairCase)
+from tut3.other_exercises_4_to_8.staircase_layouts import LayoutStairCase2
+
+from aircraft_geometryless import Aircraft
+from engine_geometryless import Engine, Nacelle
+from fuselage_geometryless import Fuselage
+from wing_geometryless import Wing as TrapezoidalWing
+
+
+class WideWing(Wing):
+    """Wing of parapy_slots.py with one lift coefficient per airfoil, so it
+    can be quantified beyond the 3 default coefficients."""
+
+    @Attribute
+    def lift_coefficients(self):
+        return [0.5 + 0.001 * i for i in range(self.n_airfoils)]
+
+
+def touch_aircraft(obj):
+    return obj.volume, obj.wing.ar, [e.nacelle.volume
+                                     for e in obj.propulsion_sys]
+
+
+def touch_airfoils(obj):
+    return [(a.chord, a.thickness, a.lift_coefficient) for a in obj.airfoils]
+
+
+def touch_steps(obj):
+    return [step.position for step in obj.steps]
+
+
+#: name: (factory, function evaluating the whole tree, input, new value,
+#: classes to profile)
+CASES = {
+    "aircraft_wide/e_radius": (
+        lambda n: Aircraft(n_of_engines=n), touch_aircraft, "e_radius", 1.7,
+        (Aircraft, Engine, Nacelle, Fuselage, TrapezoidalWing)),
+    "aircraft_wide/span": (
+        lambda n: Aircraft(n_of_engines=n), touch_aircraft, "span", 12.,
+        (Aircraft, Engine, Nacelle, Fuselage, TrapezoidalWing)),
+    "wing_airfoils/thickness": (
+        lambda n: WideWing(n_airfoils=n), touch_airfoils, "thickness", 0.3,
+        (WideWing, Airfoil)),
+    "staircase/h_step": (
+        lambda n: StairCase(n_step=n), touch_steps, "h_step", 1.2,
+        (StairCase, Box)),
+    "staircase_chained/h_step": (
+        lambda n: StairCase2(n_step=n), touch_steps, "h_step", 1.2,
+        (StairCase2, Box)),
+    "staircase_closed_form/h_step": (
+        lambda n: LayoutStairCase2(n_step=n), touch_steps, "h_step", 1.2,
+        (LayoutStairCase2, Box)),
+    "spiral_staircase/radius": (
+        lambda n: SpiralStairCase(n_step=n), touch_steps, "radius", 1.5,
+        (SpiralStairCase, Box)),
+}
+
+
+def _totals(profiler):
+    stats = profiler.stats.values()
+    return (sum(s.invalidations for s in stats),
+            sum(s.evaluations for s in stats))
+
+
+def run_case(name, n):
+    factory, touch, input_name, value, classes = CASES[name]
+
+    # timings without the profiler overhead
+    obj = factory(n)
+    touch(obj)
+    start = timer()
+    setattr(obj, input_name, value)
+    t_set = timer() - start
+    start = timer()
+    touch(obj)
+    t_eval = timer() - start
+
+    # slot counts on a second, profiled tree
+    with SlotProfiler(*classes) as profiler:
+        obj = factory(n)
+        touch(obj)
+        stale, evaluated = _totals(profiler)
+        setattr(obj, input_name, value)
+        touch(obj)
+    return {"case": name,
+            "n": n,
+            "set_time": t_set,
+            "reevaluation_time": t_eval,
+            "reevaluated_stale": _totals(profiler)[0] - stale,
+            "reevaluated": _totals(profiler)[1] - evaluated}
+
+
+def compare(results, baseline, tolerance):
+    """Returns the regressions of ``results`` w.r.t. ``baseline``."""
+    old = {(r["case"], r["n"]): r for r in baseline["results"]}
+    regressions = []
+    for new in results:
+        ref = old.get((new["case"], new["n"]))
+        if ref is None:
+            continue
+        for key in ("set_time", "reevaluation_time"):
+            if new[key] > (1 + tolerance) * ref[key]:
+                regressions.append(f"{new['case']} n={new['n']}: {key} "
+                                   f"{ref[key]:.4f} -> {new[key]:.4f} s")
+        for key in ("reevaluated_stale", "reevaluated"):
+            if key in ref and new[key] != ref[key]:
+                regressions.append(f"{new['case']} n={new['n']}: {key} "
+                                   f"{ref[key]} -> {new[key]}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[10, 100, 1000])
+    parser.add_argument("--cases", nargs="+", default=list(CASES),
+                        choices=list(CASES))
+    parser.add_argument("--out", default="bench_invalidation.json")
+    parser.add_argument("--compare", help="earlier result file")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed relative growth of the times")
+    args = parser.parse_args(argv)
+
+    results = []
+    for name in args.cases:
+        for n in args.sizes:
+            result = run_case(name, n)
+            results.append(result)
+            print(f"{name:<28} n={n:<6} set {1e3 * result['set_time']:9.3f} ms"
+                  f"  re-eval {1e3 * result['reevaluation_time']:9.3f} ms"
+                  f"  stale {result['reevaluated_stale']:6d}"
+                  f"  re-evaluated {result['reevaluated']:6d}")
+
+    with open(args.out, "w") as f:
+        json.dump({"date": datetime.now().isoformat(timespec="seconds"),
+                   "python": platform.python_version(),
+                   "machine": platform.machine(),
+                   "results": results}, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print("REGRESSION", line)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
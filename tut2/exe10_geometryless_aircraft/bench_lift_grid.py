@@ -0,0 +1,51 @@
+"""Benchmark of Aircraft.lift_grid against the per-call scalar Aircraft.lift.
+
+Run this file directly, e.g. ``python bench_lift_grid.py 50 40 20`` for a
+grid of 50 lift coefficients x 40 speeds x 20 densities.
+"""
+
+import sys
+from timeit import default_timer as timer
+
+import numpy as np
+
+from aircraft_geometryless import Aircraft
+
+
+def scalar_lift(obj, cl_lst, v_lst, rho_lst):
+    """Fills the lift tensor with one :meth:`Aircraft.lift` call per point."""
+    out = np.empty((len(cl_lst), len(v_lst), len(rho_lst)))
+    for i, cl in enumerate(cl_lst):
+        for j, v in enumerate(v_lst):
+            for k, rho in enumerate(rho_lst):
+                out[i, j, k] = obj.lift(cl, v, rho)
+    return out
+
+
+def run(n_cl=50, n_v=40, n_rho=20):
+    obj = Aircraft(span=10.0, c_root=3, c_tip=2)
+    cl_lst = np.linspace(0.1, 1.5, n_cl)
+    v_lst = np.linspace(60, 250, n_v)
+    rho_lst = np.linspace(0.3, 1.225, n_rho)
+    obj.wing.area  # evaluate the cached area up front, for both paths
+
+    start = timer()
+    reference = scalar_lift(obj, cl_lst, v_lst, rho_lst)
+    t_scalar = timer() - start
+
+    start = timer()
+    grid = obj.lift_grid(cl_lst, v_lst, rho_lst, outer=True)
+    t_grid = timer() - start
+
+    assert np.allclose(grid, reference)
+    n = grid.size
+    print(f"{n} lift evaluations")
+    print(f"scalar Aircraft.lift loop: {t_scalar:.4f} s "
+          f"({t_scalar / n * 1e6:.2f} us per point)")
+    print(f"Aircraft.lift_grid:        {t_grid:.4f} s "
+          f"({t_grid / n * 1e6:.4f} us per point)")
+    print(f"speed-up: {t_scalar / t_grid:.0f}x")
+
+
+if __name__ == '__main__':
+    run(*(int(arg) for arg in sys.argv[1:4]))
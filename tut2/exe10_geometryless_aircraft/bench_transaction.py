@@ -0,0 +1,84 @@
+"""Benchmark of updating N inputs of a large Aircraft one by one versus in a
+transaction.
+
+For N = 1 to 4 of span, c_root, c_tip and n_of_engines, and a growing number
+of engines, two update styles are compared after a full evaluation:
+
+* ``interleaved``: every assignment is followed by a read of the slots that
+  depend on it, as when an optimizer observes each intermediate state;
+* ``transaction``: all changes committed at once, then one read.
+
+Plain assignments followed by a single read are not a separate case: a
+transaction does the same work then, its gain is that no reader in between
+evaluates the model with a mix of old and new inputs.
+
+The time of the updates and reads and the number of re-evaluated slots
+(counted with the SlotProfiler) are printed. Run e.g. ``python
+bench_transaction.py 10 100 1000``.
+"""
+
+import sys
+from timeit import default_timer as timer
+
+from kbe_tools.slot_profiler import SlotProfiler
+from kbe_tools.transaction import transaction
+
+from aircraft_geometryless import Aircraft
+from engine_geometryless import Engine, Nacelle
+from fuselage_geometryless import Fuselage
+from wing_geometryless import Wing
+
+CLASSES = (Aircraft, Engine, Nacelle, Fuselage, Wing)
+CHANGES = [("span", 40.), ("c_root", 6.), ("c_tip", 1.5), ("n_of_engines", 2)]
+
+
+def touch(obj):
+    return obj.volume, obj.wing.ar, [e.nacelle.volume
+                                     for e in obj.propulsion_sys]
+
+
+def interleaved(obj, changes):
+    for name, value in changes:
+        setattr(obj, name, value)
+        touch(obj)
+
+
+def transactional(obj, changes):
+    with transaction(obj) as tx:
+        for name, value in changes:
+            tx[name] = value
+    touch(obj)
+
+
+STYLES = {"interleaved": interleaved, "transaction": transactional}
+
+
+def measure(style, n_engines, changes):
+    obj = Aircraft(n_of_engines=n_engines)
+    touch(obj)
+    start = timer()
+    STYLES[style](obj, changes)
+    elapsed = timer() - start
+
+    with SlotProfiler(*CLASSES) as profiler:
+        obj = Aircraft(n_of_engines=n_engines)
+        touch(obj)
+        before = sum(s.evaluations for s in profiler.stats.values())
+        STYLES[style](obj, changes)
+    after = sum(s.evaluations for s in profiler.stats.values())
+    return elapsed, after - before
+
+
+def run(sizes):
+    for n_engines in sizes:
+        for n_inputs in range(1, len(CHANGES) + 1):
+            print(f"{n_engines:>6} engines, {n_inputs} inputs:")
+            for style in STYLES:
+                elapsed, evaluations = measure(style, n_engines,
+                                               CHANGES[:n_inputs])
+                print(f"    {style:<12} {1e3 * elapsed:10.3f} ms"
+                      f"  {evaluations:8d} re-evaluations")
+
+
+if __name__ == '__main__':
+    run([int(arg) for arg in sys.argv[1:]] or [10, 100, 1000])
@@ -0,0 +1,136 @@
+"""Parallel design-space exploration of the geometryless KBE models.
+
+A design space is a set of columns (one per input) holding one value per
+design point. It can be built as a full-factorial grid or as a Latin
+hypercube sample. :func:`explore` splits the points in chunks over a pool of
+processes; each worker instantiates the model (e.g. ``Aircraft`` or ``Wing``)
+per point and reads the requested attributes, so every core evaluates its own
+share of the product trees. The result is again a table of columns.
+"""
+
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from os import cpu_count
+
+import numpy as np
+
+from kbe_tools.slots import get_path
+
+
+def full_factorial(**axes):
+    """Full-factorial grid over the given input axes.
+
+    >>> full_factorial(span=[10, 20], c_root=[3, 4])
+    {'span': [10, 10, 20, 20], 'c_root': [3, 4, 3, 4]}
+
+    :rtype: dict[str, list]
+    """
+    names = list(axes)
+    rows = list(itertools.product(*(axes[name] for name in names)))
+    return {name: [row[i] for row in rows] for i, name in enumerate(names)}
+
+
+def latin_hypercube(n, bounds, integers=(), seed=None):
+    """Latin hypercube sample of ``n`` points.
+
+    :param int n: number of design points
+    :param dict[str, tuple] bounds: (lower, upper) bound per input
+    :param integers: names of the inputs that must be rounded to integers,
+        e.g. ``n_of_engines``
+    :param seed: seed of the random generator, for reproducible samples
+    :rtype: dict[str, list]
+    """
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for name, (lower, upper) in bounds.items():
+        # one sample in each of the n equal strata, in random order
+        u = (rng.permutation(n) + rng.random(n)) / n
+        values = lower + u * (upper - lower)
+        if name in integers:
+            values = np.rint(values).astype(int)
+        columns[name] = values.tolist()
+    return columns
+
+
+def _evaluate_chunk(cls, names, rows, attributes):
+    """Worker function: instantiates ``cls`` per row and reads attributes."""
+    out = []
+    for row in rows:
+        obj = cls(**dict(zip(names, row)))
+        out.append(tuple(get_path(obj, path) for path in attributes))
+    return out
+
+
+def explore(cls, samples, attributes, n_workers=None, chunksize=None):
+    """Evaluates ``attributes`` of ``cls`` for every design point in
+    ``samples`` using a process pool.
+
+    :param cls: ParaPy class to instantiate, e.g. ``Aircraft``. It must be
+        importable by the worker processes (defined at module level)
+    :param dict[str, list] samples: design space, one column per input
+    :param attributes: (dotted) attribute paths to collect, e.g.
+        ``["volume", "engines_volume", "wing.area"]``
+    :param int n_workers: number of processes, defaults to the number of
+        cores. Use 1 to evaluate serially in this process
+    :param int chunksize: number of design points sent to a worker at once.
+        By default every worker gets about four chunks, which keeps the
+        inter-process traffic low while still balancing the load
+    :return: the input columns plus one column per attribute
+    :rtype: dict[str, list]
+    """
+    names = list(samples)
+    rows = list(zip(*(samples[name] for name in names)))
+    n_workers = n_workers or cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, -(-len(rows) // (4 * n_workers)))
+    chunks = [rows[i:i + chunksize] for i in range(0, len(rows), chunksize)]
+
+    if n_workers == 1:
+        results = [_evaluate_chunk(cls, names, chunk, attributes)
+                   for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            results = list(pool.map(_evaluate_chunk,
+                                    itertools.repeat(cls), itertools.repeat(names),
+                                    chunks, itertools.repeat(attributes)))
+
+    table = {name: list(samples[name]) for name in names}
+    values = [value for chunk in results for value in chunk]
+    for i, path in enumerate(attributes):
+        table[path] = [value[i] for value in values]
+    return table
+
+
+if __name__ == '__main__':
+    from timeit import default_timer as timer
+
+    from aircraft_geometryless import Aircraft
+    from wing_geometryless import Wing
+
+    design_space = latin_hypercube(20000,
+                                   {"f_radius": (2, 4),
+                                    "f_length": (40, 80),
+                                    "e_radius": (1, 2),
+                                    "e_length": (1.5, 3),
+                                    "n_of_engines": (1, 4),
+                                    "span": (8, 40),
+                                    "c_root": (3, 6),
+                                    "c_tip": (1, 3)},
+                                   integers=("n_of_engines",), seed=0)
+    attributes = ["volume", "engines_volume", "wing.area", "wing.ar",
+                  "wing.taper"]
+
+    n_cores = cpu_count() or 1
+    workers = 1
+    while True:
+        start = timer()
+        explore(Aircraft, design_space, attributes, n_workers=workers)
+        print(f"{workers:3d} worker(s): {timer() - start:.2f} s")
+        if workers >= n_cores:
+            break
+        workers = min(2 * workers, n_cores)
+
+    wings = explore(Wing, full_factorial(b=[10, 20, 30], c_root=[3, 4],
+                                         c_tip=[1, 2]),
+                    ["area", "ar", "taper"])
+    print(wings)
@@ -0,0 +1,28 @@
+"""Profiles the slot evaluations of the geometryless Aircraft.
+
+Prints the per-slot report and writes aircraft.folded, which can be turned
+into a flame graph with e.g. flamegraph.pl or https://www.speedscope.app.
+"""
+
+from kbe_tools.slot_profiler import SlotProfiler
+
+from aircraft_geometryless import Aircraft
+from engine_geometryless import Engine, Nacelle
+from fuselage_geometryless import Fuselage
+from wing_geometryless import Wing
+
+
+if __name__ == '__main__':
+    with SlotProfiler(Aircraft, Engine, Nacelle, Fuselage, Wing) as profiler:
+        obj = Aircraft(span=10.0, c_root=3, c_tip=2)
+        obj.volume
+        obj.wing.ar
+        obj.lift_grid([0.1, 0.3, 0.5], 120, 1.225)
+        # input changes invalidate the dependent slots
+        obj.n_of_engines = 2
+        obj.volume
+        obj.c_tip = 1
+        obj.wing.ar
+
+    print(profiler.report())
+    profiler.write_folded("aircraft.folded")
@@ -0,0 +1,46 @@
+"""Variants of Engine and Aircraft whose identical engines share their
+volume when result sharing is enabled (see kbe_tools.shared_results).
+
+Kept apart from engine_geometryless.py so the tutorial model itself does not
+depend on kbe_tools.
+"""
+
+from math import pi
+
+from parapy.core import Attribute, Part
+
+from kbe_tools.shared_results import shared
+
+from aircraft_geometryless import Aircraft
+from engine_geometryless import Engine
+
+
+class SharedEngine(Engine):
+
+    @Attribute
+    @shared("radius", "length")
+    def volume(self):
+        """Consider engine shape as a cylinder. Identical engines share
+        this value when result sharing is enabled.
+        :return: float
+        """
+        return pi * (self.radius ** 2) * self.length + self.nacelle.volume
+
+
+class SharedAircraft(Aircraft):
+
+    @Part
+    def propulsion_sys(self):
+        return SharedEngine(quantify=self.n_of_engines,
+                            radius=self.e_radius,
+                            length=self.e_length,
+                            label="engine")
+
+
+if __name__ == '__main__':
+    from kbe_tools.shared_results import sharing
+
+    with sharing() as table:
+        obj = SharedAircraft(n_of_engines=8)
+        print(obj.engines_volume)
+        print(f"{table.misses} engine volume evaluated, {table.hits} shared")
@@ -0,0 +1,133 @@
+"""Stress test of single-flight slot evaluation on the geometryless Aircraft.
+
+Many threads are released at the same moment on a new Aircraft and all read
+the same slots. Every attribute and part rule is counted per instance, and
+per child for parts, so any slot evaluated more than once is reported as a
+duplicate. The runs of followers, which repeat a rule after the leader is
+done to let ParaPy record its dependencies, are counted apart. Threads that
+do not finish in time are reported as a deadlock. Run with ``--off``
+to see the duplicates without single-flight evaluation, e.g. ``python
+stress_single_flight.py --threads 300 --trials 20``.
+"""
+
+import argparse
+import inspect
+import sys
+import threading
+from collections import Counter
+from functools import wraps
+
+from kbe_tools.single_flight import flight_key, following, install
+from kbe_tools.slots import (attribute_names, get_path, part_names,
+                             rule_attribute)
+
+from aircraft_geometryless import Aircraft
+from engine_geometryless import Engine, Nacelle
+from fuselage_geometryless import Fuselage
+from wing_geometryless import Wing
+
+CLASSES = (Aircraft, Engine, Nacelle, Fuselage, Wing)
+PATHS = ["volume", "engines_volume", "fuselage.volume", "wing.area",
+         "wing.ar"]
+
+
+def count_rules(classes, counts, reruns):
+    """Wraps every attribute and part rule of ``classes`` to count its
+    evaluations per (instance, slot, child index) in ``counts``, and the
+    runs of followers in ``reruns``.
+
+    :return: function that restores the original rules
+    """
+    patches, seen, lock = [], set(), threading.Lock()
+    for cls in classes:
+        parts = set(part_names(cls))
+        for name in attribute_names(cls) + part_names(cls):
+            slot = inspect.getattr_static(cls, name)
+            attr = rule_attribute(slot, name)
+            if attr is None or id(slot) in seen:
+                continue
+            seen.add(id(slot))
+            func = getattr(slot, attr)
+
+            def counted(self, _func=func, _name=name, _part=name in parts):
+                key = flight_key(self, _name, _part)
+                with lock:
+                    if following(key):
+                        reruns[key] += 1
+                    else:
+                        counts[key] += 1
+                return _func(self)
+
+            patches.append((slot, attr, func))
+            setattr(slot, attr, wraps(func)(counted))
+
+    def restore():
+        for slot, attr, func in reversed(patches):
+            setattr(slot, attr, func)
+
+    return restore
+
+
+def trial(n_threads, timeout):
+    obj = Aircraft(span=10.0, c_root=3, c_tip=2)
+    barrier = threading.Barrier(n_threads)
+    results, errors = [], []
+
+    def reader(i):
+        barrier.wait()
+        try:
+            path = PATHS[i % len(PATHS)]
+            results.append((path, get_path(obj, path)))
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=reader, args=(i,), daemon=True)
+               for i in range(n_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout)
+    hung = sum(thread.is_alive() for thread in threads)
+    values = {}
+    for path, value in results:
+        values.setdefault(path, set()).add(value)
+    inconsistent = {path for path in values if len(values[path]) > 1}
+    return hung, errors, inconsistent
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=200)
+    parser.add_argument("--trials", type=int, default=10)
+    parser.add_argument("--timeout", type=float, default=30.)
+    parser.add_argument("--off", action="store_true",
+                        help="run without single-flight evaluation")
+    args = parser.parse_args(argv)
+
+    counts, reruns = Counter(), Counter()
+    # counting sits below single-flight: followers are counted in reruns
+    restore = count_rules(CLASSES, counts, reruns)
+    uninstall = install(*CLASSES) if not args.off else (lambda: None)
+    failed = False
+    try:
+        for i in range(args.trials):
+            counts.clear()
+            reruns.clear()
+            hung, errors, inconsistent = trial(args.threads, args.timeout)
+            duplicates = sum(n - 1 for n in counts.values() if n > 1)
+            print(f"trial {i:3d}: {sum(counts.values()):5d} evaluations"
+                  f"  {duplicates:4d} duplicates"
+                  f"  {sum(reruns.values()):5d} follower runs"
+                  f"  {hung} hung threads"
+                  f"  {len(errors)} errors  {len(inconsistent)} paths with"
+                  f" differing values")
+            failed |= bool(duplicates or hung or errors or inconsistent)
+    finally:
+        uninstall()
+        restore()
+    print("FAILED" if failed else "OK")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
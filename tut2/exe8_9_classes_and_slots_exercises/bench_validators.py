@@ -0,0 +1,70 @@
+"""Benchmark of input-setting throughput with and without validation.
+
+Sets the thickness of a wing ``n`` times without a validator, with
+``val.GE(0.1) & val.LE(0.5)`` as separate ParaPy validators, and with the
+fused validator of kbe_tools.validators, checked per set or deferred to
+the end of the block. It also times checking all values as one array.
+Run e.g. ``python bench_validators.py 100000``.
+"""
+
+import sys
+from timeit import default_timer as timer
+
+import numpy as np
+from parapy.core import Base, Input, val
+
+from kbe_tools.validators import GE, IsInstance, LE, deferred_validation
+
+
+def both(*validators):
+    return lambda value: all(v(value) for v in validators)
+
+
+class PlainWing(Base):
+    thickness = Input(0.2)
+
+
+class ValWing(Base):
+    thickness = Input(0.2, validator=both(val.GE(0.1), val.LE(0.5)))
+
+
+FUSED = IsInstance(int, float) & GE(0.1) & LE(0.5)
+
+
+class FusedWing(Base):
+    thickness = Input(0.2, validator=FUSED)
+
+
+def set_all(obj, values):
+    for value in values:
+        obj.thickness = value
+
+
+def run(n=100000):
+    values = np.random.default_rng(0).uniform(0.1, 0.5, n).tolist()
+    cases = [("no validator", PlainWing, set_all),
+             ("parapy val", ValWing, set_all),
+             ("fused", FusedWing, set_all)]
+
+    def deferred(obj, values):
+        with deferred_validation():
+            set_all(obj, values)
+
+    cases.append(("fused, deferred", FusedWing, deferred))
+    for name, cls, function in cases:
+        obj = cls()
+        start = timer()
+        function(obj, values)
+        elapsed = timer() - start
+        print(f"{name:<18} {n / elapsed:14,.0f} sets/s")
+
+    array = np.asarray(values)
+    start = timer()
+    valid = FUSED.check_array(array)
+    elapsed = timer() - start
+    print(f"{'array check':<18} {n / elapsed:14,.0f} values/s"
+          f"   ({int(valid.sum())} valid)")
+
+
+if __name__ == '__main__':
+    run(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,39 @@
+"""Wing of parapy_slots.py for very large numbers of airfoils."""
+
+from parapy.core import Attribute
+
+from kbe_tools.child_columns import ChildColumns
+from tut2.exe8_9_classes_and_slots_exercises.parapy_slots import Airfoil, Wing
+
+
+class LazyWing(Wing):
+    """Variant of Wing whose airfoils are only built when they are used. The
+    quantified part builds every airfoil as soon as the sequence is touched;
+    the lazy sequence knows its length without building any. Its airfoils
+    are not children in the product tree.
+    """
+
+    @Attribute
+    def lazy_airfoils(self):
+        # the keyword expressions of Wing.airfoils, evaluated once for all
+        # airfoils; from_rule reads thickness and lift_coefficients here, so
+        # that ParaPy records them as dependencies of lazy_airfoils
+        columns = ChildColumns.from_rule(
+            self, self.n_airfoils,
+            pass_down="thickness",
+            map_down="lift_coefficients->lift_coefficient",
+            chord=lambda index: 0.1 * (index + 1))
+        return columns.sequence(Airfoil)
+
+
+# obj = LazyWing(n_airfoils=3)
+# print(len(obj.lazy_airfoils))
+# # 3
+# print(obj.lazy_airfoils.in_memory)
+# # 0
+# print(obj.lazy_airfoils[1].chord)
+# # 0.2
+# print(obj.lazy_airfoils[1].lift_coefficient)
+# # 0.6
+# print(obj.lazy_airfoils.in_memory)
+# # 1
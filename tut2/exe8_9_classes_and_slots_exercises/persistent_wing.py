@@ -0,0 +1,33 @@
+"""Wing of exercise_9 with a persistent cache.
+
+The ParaPy cache is lost when the process exits and is not shared between
+instances. With @persistent the result is also stored on disk, keyed by
+class, attribute name, the code of the rule and the values of c_root and
+taper.
+"""
+
+from parapy.core import Attribute, Base, Input
+
+from kbe_tools.persistent_cache import persistent
+
+
+class PersistentWing(Base):
+    taper = Input(0.2)
+    c_root = Input(4)
+
+    @Attribute
+    @persistent("c_root", "taper")
+    def c_tip(self):
+        print("I take 10 minutes to return")
+        return self.c_root * self.taper
+
+
+if __name__ == '__main__':
+    # evaluated here rather than on import, as it writes to the store
+    wing = PersistentWing()
+    wing.c_tip
+    # "I take 10 minutes to return" (only the very first time this script runs)
+    # 0.8
+    other_wing = PersistentWing()
+    other_wing.c_tip  # identical inputs: read from the store
+    # 0.8
@@ -0,0 +1,37 @@
+"""Train of means_of_transportation.py with its wagons positioned by one
+transform and their volume shared.
+"""
+
+from parapy.core import Attribute, Part, child
+from parapy.geom import Box
+
+from kbe_tools.shared_results import shared_value
+from kbe_tools.transform import Transform
+from tut2.inheritance_composition.means_of_transportation import Train
+
+
+class ArrayTrain(Train):
+
+    @Attribute
+    def wagon_positions(self):
+        # one transform, applied n times in a single array operation instead of one translate() per wagon
+        return Transform().translate("y", 0.5 + self.wagon_length).series(self.position, self.number_of_wagons)
+
+    @Part
+    def wagon(self):
+        return Box(quantify=self.number_of_wagons,
+                   length=self.wagon_length,
+                   height=1,
+                   width=1,
+                   position=self.wagon_positions[child.index])
+
+    @Attribute
+    def wagons_volume(self):
+        # all wagons have the same dimensions: with result sharing enabled only the first one is evaluated
+        return sum(shared_value(wagon, "volume", ("length", "width", "height")) for wagon in self.wagon)
+
+
+if __name__ == '__main__':
+    from parapy.gui import display
+    obj = ArrayTrain(label="train")
+    display(obj)
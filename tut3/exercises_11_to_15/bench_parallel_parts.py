@@ -0,0 +1,51 @@
+"""Benchmark of the concurrent evaluation of the parts of the overview
+classes against their serial evaluation.
+
+Every run builds a new instance, so no shape is cached between runs. The
+serial build in the instance is the reference; the worker processes each
+build their own instance, and the threads build in the instance itself
+(experimental, see :mod:`kbe_tools.parallel_parts`).
+Run e.g. ``python bench_parallel_parts.py 2 4 8``; the default is every
+power of two from 2 up to the number of cores.
+"""
+
+import os
+import sys
+from timeit import default_timer as timer
+
+from kbe_tools.parallel_parts import evaluate_parts, waves
+from tut3.exercises_11_to_15.exercise_13_curves_overview import (
+    CurveDefinition, CurveModification)
+from tut3.exercises_11_to_15.exercise_14_surfaces_overview import (
+    BuildingSurfaces)
+from tut3.exercises_11_to_15.exercise_15_solids_overview import (
+    BuildingSolids)
+
+
+def run(worker_counts):
+    for cls in (CurveDefinition, CurveModification, BuildingSurfaces,
+                BuildingSolids):
+        layers = waves(cls)
+        print(f"{cls.__name__}: {sum(map(len, layers))} parts in "
+              f"{len(layers)} waves of {[len(wave) for wave in layers]}")
+        start = timer()
+        evaluate_parts(cls())
+        reference = timer() - start
+        print(f"    {'serial':<19} {1e3 * reference:10.1f} ms")
+        for mode in ("process", "thread"):
+            for n_workers in worker_counts:
+                start = timer()
+                evaluate_parts(cls(), n_workers=n_workers, mode=mode)
+                elapsed = timer() - start
+                print(f"    {mode:<7} {n_workers:>3} workers "
+                      f"{1e3 * elapsed:10.1f} ms"
+                      f"   speedup {reference / elapsed:5.2f}")
+
+
+if __name__ == '__main__':
+    counts = [int(arg) for arg in sys.argv[1:]]
+    if not counts:
+        counts = [2]
+        while counts[-1] * 2 <= os.cpu_count():
+            counts.append(counts[-1] * 2)
+    run(counts)
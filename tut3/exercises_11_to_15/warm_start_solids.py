@@ -0,0 +1,39 @@
+"""Cold start versus warm start of BuildingSolids from a snapshot.
+
+The first run builds all solids and writes ``solids.snapshot``; later runs
+time reading back the shapes from it. A snapshot does not restore the
+product tree: ``snapshot.model()`` rebuilds its shapes when they are read,
+so the time to the first shape through the model is printed as well.
+"""
+
+import os
+from timeit import default_timer as timer
+
+from kbe_tools.slots import get_path
+from kbe_tools.snapshot import Snapshot, save_snapshot
+from tut3.exercises_11_to_15.exercise_15_solids_overview import (
+    BuildingSolids)
+
+PATH = "solids.snapshot"
+
+
+if __name__ == '__main__':
+    if not os.path.exists(PATH):
+        start = timer()
+        save_snapshot(BuildingSolids(), PATH)
+        print(f"cold start and snapshot   {timer() - start:8.3f} s")
+
+    with Snapshot(PATH) as snapshot:
+        first = snapshot.shape_paths[0]
+
+        start = timer()
+        get_path(snapshot.model(), first).TopoDS_Shape
+        print(f"first shape, model        {timer() - start:8.3f} s")
+
+        start = timer()
+        snapshot.shape(first)
+        print(f"first shape, snapshot     {timer() - start:8.3f} s")
+        for path in snapshot.shape_paths:
+            snapshot.shape(path)
+        print(f"all {len(snapshot.shape_paths):3d} shapes, snapshot "
+              f"{timer() - start:8.3f} s")
@@ -0,0 +1,60 @@
+"""Surfaces of exe_8_surface.py for large control-point grids.
+
+ArrayBSplineSurfaceSamples converts the point data of BSplineSurfaceSamples
+in one go into a single array, and TiledBSplineSurfaceSamples splits very
+large (e.g. memory-mapped) grids into patches that only read their own tile.
+"""
+
+from parapy.core import Attribute, Base, Input, Part, child
+from parapy.geom import BSplineSurface
+
+from kbe_tools.grid_loader import tiles as grid_tiles, tile_view
+from kbe_tools.point_cloud import PointCloud
+from tut3.other_exercises_4_to_8.exe_8_surface import BSplineSurfaceSamples
+
+
+class ArrayBSplineSurfaceSamples(BSplineSurfaceSamples):
+
+    @Attribute(in_tree=True)
+    def points(self):
+        """A PointCloud converts the tuples in the point data in one go into
+        a single array and only creates Point objects when they are indexed.
+
+        :rtype: PointCloud
+        """
+        return PointCloud.from_coords(self.data)
+
+
+class TiledBSplineSurfaceSamples(Base):
+    """Variant for very large (e.g. memory-mapped) grids: one BSplineSurface
+    patch per tile of at most ``tile_rows`` x ``tile_cols`` control points.
+    Patches only read their own tile of ``data``.
+    """
+
+    #: grid of points, e.g. grid_loader.load_grid("scan.npy")
+    #: :type: PointCloud
+    data = Input()
+    tile_rows = Input(64)
+    tile_cols = Input(64)
+
+    @Attribute
+    def tiles(self):
+        """Row and column index ranges of every tile.
+
+        :rtype: list[tuple]
+        """
+        return grid_tiles(self.data.shape, self.tile_rows, self.tile_cols)
+
+    @Part
+    def patches(self):
+        return BSplineSurface(quantify=len(self.tiles),
+                              control_points=tile_view(self.data, *self.tiles[child.index]))
+
+
+if __name__ == '__main__':
+    from parapy.gui import display
+    obj = ArrayBSplineSurfaceSamples()
+    # for a large measured grid file:
+    # from kbe_tools.grid_loader import load_grid
+    # obj = TiledBSplineSurfaceSamples(data=load_grid("scan.npy"))
+    display(obj)
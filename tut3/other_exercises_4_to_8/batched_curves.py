@@ -0,0 +1,67 @@
+"""BSplineSamples of exe_7_curves.py with array-backed points and batched
+curve queries.
+
+BSplineSamples keeps its points as a list of Point objects and projects
+``point_to_project`` on every curve twice (for ``projected_points`` and
+``distances_from_point``), and then asks every curve for a tangent.
+BatchedBSplineSamples keeps the points in a single array and answers all
+three attributes from one batched projection.
+"""
+
+from parapy.core import Attribute
+
+from kbe_tools.curve_queries import CurveQueries, as_points, as_vectors
+from kbe_tools.point_cloud import PointCloud
+from kbe_tools.spatial_index import BVH
+from tut3.other_exercises_4_to_8.exe_7_curves import BSplineSamples
+
+
+class BatchedBSplineSamples(BSplineSamples):
+
+    @Attribute
+    def pts(self):
+        # one array for all points; Point objects are only made when indexed
+        return PointCloud.from_coords(self.pt_coords_list)
+
+    @Attribute
+    def projection(self):
+        """Projection of point_to_project on all curves, computed once and
+        shared by projected_points, distances_from_point and
+        tangent_at_points. Dictionary of arrays with keys point, distance,
+        u and tangent, each with one row per curve.
+        """
+        result = CurveQueries(self.crvs).project([self.point_to_project])
+        return {key: value[0] for key, value in result.items()}
+
+    @Attribute(in_tree=True)
+    def projected_points(self):
+        return as_points(self.projection["point"])
+
+    @Attribute
+    def distances_from_point(self):
+        return self.projection["distance"].tolist()
+
+    @Attribute
+    def tangent_at_points(self):
+        # same as [crv.tangent_at_point(self.projected_points[crv.index]) for crv in self.crvs]
+        return as_vectors(self.projection["tangent"])
+
+    @Attribute
+    def crvs_index(self):
+        """Bounding volume hierarchy over the curves: proximity queries only
+        project on the curves whose bounding box is close enough. The boxes
+        are read here, so crvs_index depends on the bbox of every curve."""
+        return BVH(self.crvs,
+                   distance=lambda crv, pt: crv.projected_point(pt)['distance'])
+
+    @Attribute
+    def nearest_crv(self):
+        """The curve nearest to point_to_project and its distance"""
+        return self.crvs_index.nearest(self.point_to_project)
+
+
+if __name__ == '__main__':
+    from parapy.gui import display
+
+    obj = BatchedBSplineSamples()
+    display(obj)
@@ -0,0 +1,68 @@
+"""Benchmark of batched curve queries: 10^4 query points x 10^2 curves.
+
+Compares the per-attribute approach of the original BSplineSamples (two
+projections plus one tangent query per point and curve) with CurveQueries.
+The kernel-based paths are timed on a subset of the points and extrapolated.
+Run e.g. ``python bench_curve_queries.py 10000 100``.
+"""
+
+import sys
+from timeit import default_timer as timer
+
+import numpy as np
+from parapy.geom import FittedCurve, Point
+
+from kbe_tools.curve_queries import CurveQueries
+
+
+def random_curves(n_curves, rng):
+    curves = []
+    for _ in range(n_curves):
+        coords = np.cumsum(rng.normal(size=(8, 3)), axis=0)
+        curves.append(FittedCurve(points=[Point(*xyz)
+                                          for xyz in coords.tolist()]))
+    return curves
+
+
+def per_attribute(curves, points):
+    """The access pattern of the original BSplineSamples attributes."""
+    for pt in points:
+        projected = [crv.projected_point(pt)["point"] for crv in curves]
+        [crv.projected_point(pt)["distance"] for crv in curves]
+        [crv.tangent_at_point(projected[i]) for i, crv in enumerate(curves)]
+
+
+def run(n_points=10000, n_curves=100, n_subset=100):
+    rng = np.random.default_rng(0)
+    curves = random_curves(n_curves, rng)
+    points = rng.uniform(-5, 5, size=(n_points, 3))
+    subset = [Point(*xyz) for xyz in points[:n_subset].tolist()]
+    scale = n_points / n_subset
+
+    start = timer()
+    per_attribute(curves, subset)
+    t_old = (timer() - start) * scale
+
+    queries = CurveQueries(curves)
+    start = timer()
+    exact = queries.project(points[:n_subset], method="exact")
+    t_exact = (timer() - start) * scale
+
+    start = timer()
+    queries.polylines
+    t_sample = timer() - start
+    start = timer()
+    sampled = queries.project(points, method="sampled")
+    t_sampled = timer() - start
+
+    error = np.abs(sampled["distance"][:n_subset] - exact["distance"]).max()
+    print(f"{n_points} points x {n_curves} curves")
+    print(f"per attribute (extrapolated): {t_old:9.2f} s")
+    print(f"CurveQueries exact (extrap.): {t_exact:9.2f} s")
+    print(f"CurveQueries sampled:         {t_sampled:9.2f} s "
+          f"(+ {t_sample:.2f} s to sample the curves once)")
+    print(f"max distance error of the sampled method: {error:.2e}")
+
+
+if __name__ == '__main__':
+    run(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,64 @@
+"""Benchmark of instanced versus per-shape drawing of the staircase steps.
+
+For a growing number of steps, reports the number of draw calls, the memory
+of the mesh and instance buffers, and the CPU frame time of the vertex stage
+(as done by an offscreen software renderer), once with one shared mesh per
+batch and once with one mesh and draw call per step. Run e.g. ``python
+bench_instancing.py 1000 10000 100000``.
+"""
+
+import sys
+from timeit import default_timer as timer
+
+import numpy as np
+
+from kbe_tools.instancing import instance_batches, world_vertices
+from kbe_tools.tessellation_cache import TessellationCache
+from tut3.other_exercises_4_to_8.staircase_layouts import LayoutStairCase3
+
+
+def frame_time(function, repeat=5):
+    """Best of ``repeat`` timings of ``function()``, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = timer()
+        function()
+        best = min(best, timer() - start)
+    return best
+
+
+def run(n_step):
+    obj = LayoutStairCase3(n_step=n_step)
+    cache = TessellationCache(store=False)
+
+    start = timer()
+    batches, singles = instance_batches(obj.steps, cache, lod="coarse")
+    t_build = timer() - start
+    instanced_bytes = sum(batch.nbytes for batch in batches)
+
+    # per-shape drawing: one global mesh and one draw call per step
+    meshes = [(batch.mesh, batch.transforms[i])
+              for batch in batches for i in range(len(batch))]
+    per_shape_bytes = sum(mesh.vertices.nbytes + mesh.triangles.nbytes
+                          for mesh, _ in meshes)
+
+    def draw_instanced():
+        for batch in batches:
+            world_vertices(batch)
+
+    def draw_per_shape():
+        for mesh, matrix in meshes:
+            mesh.vertices.astype(np.float32) @ matrix[:3, :3].T + matrix[:3, 3]
+
+    print(f"{n_step:>8} steps   build {t_build:8.2f} s")
+    print(f"    instanced  {len(batches) + len(singles):>8} draw calls"
+          f" {instanced_bytes / 2 ** 20:10.2f} MiB"
+          f" {1e3 * frame_time(draw_instanced):10.2f} ms/frame")
+    print(f"    per shape  {len(meshes) + len(singles):>8} draw calls"
+          f" {per_shape_bytes / 2 ** 20:10.2f} MiB"
+          f" {1e3 * frame_time(draw_per_shape):10.2f} ms/frame")
+
+
+if __name__ == '__main__':
+    for arg in sys.argv[1:] or ["1000", "10000", "100000"]:
+        run(int(arg))
@@ -0,0 +1,43 @@
+"""Benchmark of the staircase variants at a large number of steps.
+
+Compares the time to position the last step, and all steps, for the
+child.index rule (StairCase), the child.previous chain (StairCase2), the
+positions list (StairCase3) and their array-backed variants of
+staircase_layouts.py. Run e.g. ``python bench_step_layout.py 10000``.
+"""
+
+import sys
+from timeit import default_timer as timer
+
+from tut3.other_exercises_4_to_8.exe_5_6_staircase import (
+    StairCase, StairCase2, StairCase3, SpiralStairCase2, SpiralStairCase3)
+from tut3.other_exercises_4_to_8.staircase_layouts import (
+    LayoutStairCase2, LayoutStairCase3, LayoutSpiralStairCase2,
+    LayoutSpiralStairCase3)
+
+#: classes that chain child.previous
+CHAINED = (StairCase2, SpiralStairCase2)
+
+
+def run(n_step=10000):
+    for cls in (StairCase, StairCase2, LayoutStairCase2, StairCase3,
+                LayoutStairCase3, SpiralStairCase2, LayoutSpiralStairCase2,
+                SpiralStairCase3, LayoutSpiralStairCase3):
+        obj = cls(n_step=n_step)
+        start = timer()
+        if cls in CHAINED:
+            # asking for the last step directly would recurse n_step deep
+            for step in obj.steps:
+                step.position
+        last = obj.steps[-1].position
+        t_last = timer() - start
+        start = timer()
+        for step in obj.steps:
+            step.position
+        t_all = timer() - start
+        print(f"{cls.__name__:<24} last step {1e3 * t_last:10.2f} ms"
+              f"   all steps {1e3 * t_all:10.2f} ms   {last.location}")
+
+
+if __name__ == '__main__':
+    run(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,29 @@
+"""Profiles the slot evaluations of the staircases of exe_5_6_staircase.py
+and staircase_layouts.py.
+
+Prints the per-slot report and writes staircase.folded, which can be turned
+into a flame graph with e.g. flamegraph.pl or https://www.speedscope.app.
+"""
+
+from parapy.geom import Box
+
+from kbe_tools.slot_profiler import SlotProfiler
+from tut3.other_exercises_4_to_8.exe_5_6_staircase import (
+    StairCase, StairCase3, SpiralStairCase)
+from tut3.other_exercises_4_to_8.staircase_layouts import (
+    LayoutStairCase2, LayoutStairCase3)
+
+CLASSES = (StairCase, LayoutStairCase2, StairCase3, LayoutStairCase3,
+           SpiralStairCase)
+
+
+if __name__ == '__main__':
+    with SlotProfiler(*CLASSES, Box) as profiler:
+        for cls in CLASSES:
+            obj = cls(n_step=50)
+            [step.position for step in obj.steps]
+            obj.h_step = 1.2
+            [step.position for step in obj.steps]
+
+    print(profiler.report(limit=30))
+    profiler.write_folded("staircase.folded")
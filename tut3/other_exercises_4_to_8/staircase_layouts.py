@@ -0,0 +1,108 @@
+"""Staircases of exe_5_6_staircase.py with array-backed step positions.
+
+The variants of exe_5_6_staircase.py position every step with its own
+``translate``/``rotate`` calls, and StairCase2 and SpiralStairCase2 chain
+them over ``child.previous``: the last step then builds and evaluates all
+earlier steps recursively. The subclasses below compute all positions at
+once as a :class:`~kbe_tools.step_layout.StepLayout`, which only creates a
+``Position`` when a step asks for it, so each step is positioned in O(1)
+from its index.
+"""
+
+from parapy.core import Attribute, Part, child
+from parapy.geom import Box, translate
+
+from kbe_tools.step_layout import StepLayout
+from tut3.other_exercises_4_to_8.exe_5_6_staircase import (
+    StairCase2, StairCase3, SpiralStairCase2, SpiralStairCase3)
+
+
+class LayoutStairCase2(StairCase2):
+    """StairCase2 with its child.previous recurrence::
+
+        position=self.position
+                 if child.index == 0
+                 else translate(child.previous.position,
+                                'y', self.l_step, 'z', self.h_step)
+
+    evaluated in closed form by ``step_positions``.
+    """
+
+    @Attribute
+    def step_positions(self):
+        """:rtype: StepLayout"""
+        return StepLayout.recurrence(
+            self.position, self.n_step,
+            translation=(self.position.Vy * self.l_step +
+                         self.position.Vz * self.h_step))
+
+    @Part
+    def steps(self):
+        return Box(quantify=self.n_step,
+                   width=self.w_step,
+                   length=self.l_step,
+                   height=self.t_step,
+                   color=self.colors[child.index % len(self.colors)],
+                   position=self.step_positions[child.index])
+
+
+class LayoutStairCase3(StairCase3):
+    """StairCase3 with its ``positions`` list computed at once as arrays."""
+
+    @Attribute
+    def positions(self):
+        """:rtype: StepLayout"""
+        return StepLayout.straight(self.position, self.n_step,
+                                   self.l_step, self.h_step)
+
+
+class LayoutSpiralStairCase2(SpiralStairCase2):
+    """SpiralStairCase2 with its child.previous recurrence::
+
+        position=translate(self.position, 'x', self.radius)
+                 if child.index == 0
+                 else translate(rotate(child.previous.position,
+                                       'z', self.angle_step,
+                                       ref=self.position),
+                                'z', self.h_step)
+
+    evaluated in closed form by ``step_positions``.
+    """
+
+    @Attribute
+    def step_positions(self):
+        """:rtype: StepLayout"""
+        return StepLayout.recurrence(
+            translate(self.position, 'x', self.radius), self.n_step,
+            translation=self.position.Vz * self.h_step,
+            axis=self.position.Vz, angle=self.angle_step,
+            center=self.position.location)
+
+    @Part
+    def steps(self):
+        return Box(quantify=self.n_step,
+                   width=self.w_step,
+                   length=self.l_step,
+                   height=self.t_step,
+                   color=self.colors[child.index % len(self.colors)],
+                   position=self.step_positions[child.index])
+
+
+class LayoutSpiralStairCase3(SpiralStairCase3):
+    """SpiralStairCase3 with its ``positions`` list computed at once as
+    arrays.
+    """
+
+    @Attribute
+    def positions(self):
+        """:rtype: StepLayout"""
+        return StepLayout.spiral(self.position, self.n_step, self.radius,
+                                 self.angle_step, self.h_step)
+
+
+if __name__ == '__main__':
+    from parapy.gui import display
+    display([LayoutStairCase2(label="staircase2"),
+             LayoutStairCase3(label="staircase3"),
+             LayoutSpiralStairCase2(label="spiralStaircase2"),
+             LayoutSpiralStairCase3(label="spiralStaircase3")])